@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
+
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.constants import AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL
+from reviews.models import User
+
+AUTH_USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in (
+        'id', 'username', 'role', 'is_staff', 'is_superuser', 'is_active'
+    )
+)
+
+
+class UserCache:
+
+    def __init__(self, size=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return values
+
+    def set(self, key, values):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, values)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+def user_changed(sender, instance, **kwargs):
+    user_cache.delete(instance.pk)
+    transaction.on_commit(partial(user_cache.delete, instance.pk))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        values = user_cache.get(user_id)
+        if values is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, tuple(
+                getattr(user, field) for field in AUTH_USER_FIELDS
+            ))
+            return user
+        return User.from_db(User.objects.db, AUTH_USER_FIELDS, values)
@@ -0,0 +1,67 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'catalog_version'
+CACHE_NAMES = ('titles', 'leaderboards', 'trending')
+CACHE_HITS = 'hits'
+CACHE_MISSES = 'misses'
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def catalog_changed(**kwargs):
+    transaction.on_commit(bump_catalog_version)
+
+
+def get_counter_key(name, event):
+    return f'{name}_cache_{event}'
+
+
+def increment_counter(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def get_cache_stats():
+    keys = {
+        (name, event): get_counter_key(name, event)
+        for name in CACHE_NAMES
+        for event in (CACHE_HITS, CACHE_MISSES)
+    }
+    counters = cache.get_many(keys.values())
+    return {
+        name: {
+            event: counters.get(keys[(name, event)], 0)
+            for event in (CACHE_HITS, CACHE_MISSES)
+        }
+        for name in CACHE_NAMES
+    }
+
+
+def get_response_cache_key(request, name, version):
+    params = sorted(
+        (key, sorted(values)) for key, values in request.query_params.lists()
+    )
+    digest = md5(
+        f'{request.build_absolute_uri(request.path)}?{params}'.encode()
+    ).hexdigest()
+    return f'{name}:{version}:{digest}'
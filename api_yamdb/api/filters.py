@@ -1,6 +1,26 @@
+from django import forms
+from django.db.models import F
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
 
+from api.pagination import TitleCursorPagination
+from reviews.constants import (
+    MAX_VALUE_SCORE,
+    MAX_VALUE_YEAR,
+    MIN_VALUE_SCORE,
+    MIN_VALUE_YEAR,
+    TITLE_ORDERING_FIELDS
+)
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class IntegerFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class FloatFilter(filters.NumberFilter):
+    field_class = forms.FloatField
 
 
 class TitleFilter(filters.FilterSet):
@@ -16,7 +36,53 @@ class TitleFilter(filters.FilterSet):
         field_name='genre__slug',
         lookup_expr='exact'
     )
+    year = IntegerFilter(
+        field_name='year',
+        lookup_expr='exact',
+        min_value=MIN_VALUE_YEAR,
+        max_value=MAX_VALUE_YEAR
+    )
+    year_min = IntegerFilter(
+        field_name='year',
+        lookup_expr='gte',
+        min_value=MIN_VALUE_YEAR,
+        max_value=MAX_VALUE_YEAR
+    )
+    year_max = IntegerFilter(
+        field_name='year',
+        lookup_expr='lte',
+        min_value=MIN_VALUE_YEAR,
+        max_value=MAX_VALUE_YEAR
+    )
+    rating_min = FloatFilter(
+        field_name='rating',
+        lookup_expr='gte',
+        min_value=MIN_VALUE_SCORE,
+        max_value=MAX_VALUE_SCORE
+    )
+    search = filters.CharFilter(method='filter_search')
+    ordering = filters.ChoiceFilter(
+        choices=[
+            (value, value) for value in TITLE_ORDERING_FIELDS
+        ],
+        method='filter_ordering'
+    )
 
     class Meta:
         model = Title
         fields = ('year',)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+    def filter_ordering(self, queryset, name, value):
+        if TitleCursorPagination.cursor_query_param in self.request.GET:
+            raise ValidationError(
+                {'ordering': 'Сортировка недоступна при курсорной пагинации'}
+            )
+        field = value.lstrip('-')
+        if value.startswith('-'):
+            return queryset.order_by(
+                F(field).desc(nulls_last=True), F('id').desc()
+            )
+        return queryset.order_by(F(field).asc(nulls_last=True), 'id')
@@ -0,0 +1,455 @@
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment
+)
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.provisioning import provision_users
+
+PROVISION_BATCH_SIZE = 100
+BULK_REVIEWS_SIZE = 20
+BASELINE_PATH = settings.BASE_DIR.parent / 'benchmarks' / 'baseline.json'
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class QueryTimer:
+
+    def __init__(self):
+        self.count = 0
+        self.writes = 0
+        self.elapsed = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.elapsed += time.perf_counter() - started
+            self.count += 1
+            self.writes += sql.lstrip().upper().startswith(WRITE_STATEMENTS)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку и SQL-запросы эндпоинтов API на большом наборе '
+        'данных и сравнивает их с базовыми значениями'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1000),
+            ('titles', 1000),
+            ('reviews', 50000),
+            ('comments', 20000),
+        ):
+            parser.add_argument(f'--{name}', type=int, default=default)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество запросов к каждому эндпоинту'
+        )
+        parser.add_argument(
+            '--report',
+            default='benchmark_report.json',
+            help='Файл для JSON-отчёта'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(BASELINE_PATH),
+            help='Файл с базовыми значениями'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.25,
+            help='Допустимый рост p95, доля от базового значения'
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=1.0,
+            help='Рост p95 меньше этого значения не считается регрессией'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Сохранить отчёт как новые базовые значения'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            call_command(
+                'generate_fake_data',
+                users=options['users'],
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+                seed=options['seed'],
+                stdout=self.stdout
+            )
+            routes = self.run_routes(options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'created': timezone.now().isoformat(),
+            'dataset': {
+                name: options[name]
+                for name in ('users', 'titles', 'reviews', 'comments', 'seed')
+            },
+            'repeat': options['repeat'],
+            'routes': routes,
+        }
+        Path(options['report']).write_text(
+            json.dumps(report, indent=2, ensure_ascii=False),
+            encoding='utf-8'
+        )
+        for name, result in routes.items():
+            self.stdout.write(
+                f'{name:<28} p50 {result["p50_ms"]:>8.2f} мс  '
+                f'p95 {result["p95_ms"]:>8.2f} мс  '
+                f'SQL {result["queries"]:>3} ({result["sql_ms"]:.2f} мс)  '
+                f'записей {result["writes"]:>3}'
+            )
+        baseline = Path(options['baseline'])
+        if options['update_baseline']:
+            baseline.parent.mkdir(parents=True, exist_ok=True)
+            baseline.write_text(
+                json.dumps(report, indent=2, ensure_ascii=False),
+                encoding='utf-8'
+            )
+            self.stdout.write(self.style.SUCCESS(f'Сохранено в {baseline}'))
+            return
+        if not baseline.exists():
+            self.stdout.write(self.style.WARNING(
+                f'{baseline} не найден, сравнение пропущено'
+            ))
+            return
+        regressions = self.compare(
+            routes,
+            json.loads(baseline.read_text(encoding='utf-8'))['routes'],
+            options['threshold'],
+            options['min_delta_ms']
+        )
+        if regressions:
+            raise CommandError(
+                'Обнаружены регрессии:\n' + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
+
+    def compare(self, routes, baseline, threshold, min_delta_ms):
+        regressions = []
+        for name, result in routes.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if result['queries'] > previous['queries']:
+                regressions.append(
+                    f'{name}: SQL-запросов {previous["queries"]} -> '
+                    f'{result["queries"]}'
+                )
+            if result['writes'] > previous.get('writes', result['writes']):
+                regressions.append(
+                    f'{name}: записей в БД {previous["writes"]} -> '
+                    f'{result["writes"]}'
+                )
+            if (
+                result['p95_ms'] > previous['p95_ms'] * (1 + threshold)
+                and result['p95_ms'] - previous['p95_ms'] > min_delta_ms
+            ):
+                regressions.append(
+                    f'{name}: p95 {previous["p95_ms"]:.2f} -> '
+                    f'{result["p95_ms"]:.2f} мс'
+                )
+        return regressions
+
+    def measure(self, request, repeat):
+        latencies = []
+        sql_times = []
+        queries = 0
+        writes = 0
+        for iteration in range(repeat):
+            cache.clear()
+            timer = QueryTimer()
+            with connection.execute_wrapper(timer):
+                started = time.perf_counter()
+                response = request(iteration)
+                latencies.append((time.perf_counter() - started) * 1000)
+            if response is not None and response.status_code >= 400:
+                raise CommandError(
+                    f'Ответ {response.status_code}: {response.content[:200]}'
+                )
+            queries = max(queries, timer.count)
+            writes = max(writes, timer.writes)
+            sql_times.append(timer.elapsed * 1000)
+        return {
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'queries': queries,
+            'writes': writes,
+            'sql_ms': round(statistics.median(sql_times), 3),
+        }
+
+    def get_client(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        return client
+
+    def export(self, client, url):
+        response = client.get(url)
+        if response.status_code < 400:
+            b''.join(response.streaming_content)
+        return response
+
+    def get_routes(self, repeat):
+        client = APIClient()
+        admin = User.objects.create_user(
+            username='benchmark_admin',
+            email='benchmark_admin@yamdb.fake',
+            role=User.ADMIN
+        )
+        admin_client = self.get_client(admin)
+        writers = provision_users(
+            {
+                'username': f'benchmark_writer_{index}',
+                'email': f'benchmark_writer_{index}@yamdb.fake',
+            }
+            for index in range(repeat)
+        )
+        writer_clients = [self.get_client(writer) for writer in writers]
+        token_user = User.objects.create_user(
+            username='benchmark_token',
+            email='benchmark_token@yamdb.fake'
+        )
+        confirmation_code = default_token_generator.make_token(token_user)
+        title = Title.objects.order_by('-rating_count').first()
+        review = Review.objects.filter(title=title).annotate(
+            total=Count('comments')
+        ).order_by('-total').first()
+        genre = Genre.objects.filter(titles=title).first()
+        category = Category.objects.first()
+        titles_url = '/api/v1/titles/'
+        title_url = f'{titles_url}{title.id}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        title_ids = list(
+            Title.objects.exclude(pk=title.pk).order_by(
+                '-rating_count'
+            ).values_list('pk', flat=True)[:BULK_REVIEWS_SIZE]
+        )
+        comment = review.comments.order_by('pk').first()
+        comment_url = f'{comments_url}{comment.id}/'
+        users_url = '/api/v1/users/'
+        writer_url = f'{users_url}{writers[0].username}/'
+        deleted_titles = list(
+            Title.objects.exclude(
+                pk__in=[title.pk, *title_ids]
+            ).order_by('-rating_count').values_list('pk', flat=True)[:repeat]
+        )
+        deleted_reviews = list(
+            Review.objects.exclude(
+                title_id__in=[title.pk, *deleted_titles]
+            ).order_by('-comments_count').values_list(
+                'title_id', 'pk'
+            )[:repeat]
+        )
+        deleted_comments = list(
+            Comment.objects.exclude(review=review).order_by('pk').values_list(
+                'review__title_id', 'review_id', 'pk'
+            )[:repeat]
+        )
+        deleted_users = list(
+            User.objects.filter(
+                username__startswith='fake_user_'
+            ).annotate(total=Count('reviews')).order_by(
+                '-total', 'pk'
+            ).values_list('username', flat=True)[:repeat]
+        )
+        return {
+            'titles_list': lambda i: client.get(titles_url),
+            'titles_list_page_10': lambda i: client.get(
+                titles_url, {'page': 10}
+            ),
+            'titles_list_cursor': lambda i: client.get(
+                titles_url, {'cursor': ''}
+            ),
+            'titles_filter_genre': lambda i: client.get(
+                titles_url, {'genre': genre.slug}
+            ),
+            'titles_filter_category': lambda i: client.get(
+                titles_url, {'category': category.slug}
+            ),
+            'titles_filter_year': lambda i: client.get(
+                titles_url, {'year': title.year}
+            ),
+            'titles_filter_name': lambda i: client.get(
+                titles_url, {'name': title.name[:5]}
+            ),
+            'titles_search': lambda i: client.get(
+                titles_url, {'search': title.name.split()[0]}
+            ),
+            'titles_order_rating': lambda i: client.get(
+                titles_url, {'ordering': '-rating'}
+            ),
+            'titles_order_year': lambda i: client.get(
+                titles_url, {'ordering': 'year'}
+            ),
+            'titles_filter_ranges': lambda i: client.get(titles_url, {
+                'year_min': title.year - 10,
+                'year_max': title.year + 10,
+                'rating_min': 5,
+            }),
+            'titles_histograms': lambda i: client.get(
+                f'{titles_url}histograms/',
+                {'ids': ','.join(map(str, [title.pk, *title_ids]))}
+            ),
+            'title_detail': lambda i: client.get(title_url),
+            'reviews_list': lambda i: client.get(reviews_url),
+            'review_detail': lambda i: client.get(
+                f'{reviews_url}{review.id}/'
+            ),
+            'comments_list': lambda i: client.get(comments_url),
+            'comment_detail': lambda i: client.get(comment_url),
+            'categories_list': lambda i: client.get('/api/v1/categories/'),
+            'genres_list': lambda i: client.get('/api/v1/genres/'),
+            'leaderboards': lambda i: client.get('/api/v1/leaderboards/'),
+            'leaderboards_genre': lambda i: client.get(
+                '/api/v1/leaderboards/',
+                {'genre': genre.slug, 'order': 'reviews'}
+            ),
+            'trending': lambda i: client.get(
+                '/api/v1/trending/', {'days': 7}
+            ),
+            'cache_stats': lambda i: admin_client.get(
+                '/api/v1/cache/stats/'
+            ),
+            'export_titles': lambda i: self.export(
+                admin_client, '/api/v1/export/titles/'
+            ),
+            'export_genre_csv': lambda i: self.export(
+                admin_client, '/api/v1/export/genre/?output=csv'
+            ),
+            'users_list': lambda i: admin_client.get(users_url),
+            'user_detail': lambda i: admin_client.get(writer_url),
+            'users_me': lambda i: admin_client.get('/api/v1/users/me/'),
+            'auth_signup': lambda i: client.post('/api/v1/auth/signup/', {
+                'username': f'benchmark_signup_{i}',
+                'email': f'benchmark_signup_{i}@yamdb.fake',
+            }),
+            'auth_token': lambda i: client.post('/api/v1/auth/token/', {
+                'username': token_user.username,
+                'confirmation_code': confirmation_code,
+            }),
+            'users_provision_batch': self.provision_batch,
+            'review_create': lambda i: writer_clients[i].post(
+                reviews_url, {'text': 'Замер', 'score': 7}
+            ),
+            'reviews_bulk': lambda i: writer_clients[i].post(
+                '/api/v1/reviews/bulk/',
+                [
+                    {'title': title_id, 'text': 'Замер', 'score': 6}
+                    for title_id in title_ids
+                ],
+                format='json'
+            ),
+            'comment_create': lambda i: writer_clients[i].post(
+                comments_url, {'text': 'Замер'}
+            ),
+            'title_create': lambda i: admin_client.post(titles_url, {
+                'name': f'Замер {i}',
+                'year': title.year,
+                'genre': [genre.slug],
+                'category': category.slug,
+            }),
+            'category_create': lambda i: admin_client.post(
+                '/api/v1/categories/',
+                {'name': f'Замер {i}', 'slug': f'benchmark-category-{i}'}
+            ),
+            'genre_create': lambda i: admin_client.post(
+                '/api/v1/genres/',
+                {'name': f'Замер {i}', 'slug': f'benchmark-genre-{i}'}
+            ),
+            'user_create': lambda i: admin_client.post(users_url, {
+                'username': f'benchmark_user_{i}',
+                'email': f'benchmark_user_{i}@yamdb.fake',
+            }),
+            'title_update': lambda i: admin_client.patch(
+                title_url, {'description': f'Замер {i}'}
+            ),
+            'review_update': lambda i: admin_client.patch(
+                f'{reviews_url}{review.id}/', {'score': i % 10 + 1}
+            ),
+            'comment_update': lambda i: admin_client.patch(
+                comment_url, {'text': f'Замер {i}'}
+            ),
+            'user_update': lambda i: admin_client.patch(
+                writer_url, {'bio': f'Замер {i}'}
+            ),
+            'users_me_update': lambda i: admin_client.patch(
+                f'{users_url}me/', {'bio': f'Замер {i}'}
+            ),
+            'comment_delete': lambda i: admin_client.delete(
+                '/api/v1/titles/{}/reviews/{}/comments/{}/'.format(
+                    *deleted_comments[i]
+                )
+            ),
+            'review_delete': lambda i: admin_client.delete(
+                '/api/v1/titles/{}/reviews/{}/'.format(*deleted_reviews[i])
+            ),
+            'title_delete': lambda i: admin_client.delete(
+                f'{titles_url}{deleted_titles[i]}/'
+            ),
+            'user_delete': lambda i: admin_client.delete(
+                f'{users_url}{deleted_users[i]}/'
+            ),
+            'category_delete': lambda i: admin_client.delete(
+                f'/api/v1/categories/benchmark-category-{i}/'
+            ),
+            'genre_delete': lambda i: admin_client.delete(
+                f'/api/v1/genres/benchmark-genre-{i}/'
+            ),
+        }
+
+    def provision_batch(self, iteration):
+        provision_users(
+            {
+                'username': f'benchmark_batch_{iteration}_{index}',
+                'email': f'benchmark_batch_{iteration}_{index}@yamdb.fake',
+            }
+            for index in range(PROVISION_BATCH_SIZE)
+        )
+
+    def run_routes(self, repeat):
+        return {
+            name: self.measure(request, repeat)
+            for name, request in self.get_routes(repeat).items()
+        }
@@ -1,4 +1,18 @@
-from rest_framework import mixins, viewsets
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.cache import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    get_catalog_version,
+    get_counter_key,
+    get_response_cache_key,
+    increment_counter
+)
+from reviews.constants import LEADERBOARD_MAX_SIZE, LEADERBOARD_SIZE
 
 
 class ListCreateDestroyViewSet(
@@ -8,3 +22,69 @@ class ListCreateDestroyViewSet(
     viewsets.GenericViewSet,
 ):
     pass
+
+
+class CursorPaginationMixin:
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            if (
+                self.cursor_pagination_class is not None
+                and self.cursor_pagination_class.cursor_query_param
+                in self.request.query_params
+            ):
+                pagination_class = self.cursor_pagination_class
+            self._paginator = (
+                pagination_class() if pagination_class is not None else None
+            )
+        return self._paginator
+
+
+class CatalogCacheMixin:
+    cache_name = None
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = get_response_cache_key(
+            request, self.cache_name, get_catalog_version()
+        )
+        data = cache.get(key)
+        if data is not None:
+            increment_counter(get_counter_key(self.cache_name, CACHE_HITS))
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        increment_counter(get_counter_key(self.cache_name, CACHE_MISSES))
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.TITLES_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class LimitMixin:
+    default_limit = LEADERBOARD_SIZE
+    max_limit = LEADERBOARD_MAX_SIZE
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get(
+                'limit', self.default_limit
+            ))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.max_limit:
+            raise ValidationError(
+                {'limit': f'Укажите число от 1 до {self.max_limit}'}
+            )
+        return limit
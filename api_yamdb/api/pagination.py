@@ -0,0 +1,121 @@
+import binascii
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.constants import MAX_ID_VALUE
+
+
+class CursorEncoder(DjangoJSONEncoder):
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('id',)
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        position = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param),
+            queryset.model
+        )
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        results = list(
+            queryset.order_by(*self.ordering)[:self.page_size + 1]
+        )
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_position_filter(self, position):
+        position_filter = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            position_filter |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return position_filter
+
+    def get_position(self, instance):
+        return [
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ]
+
+    def encode_cursor(self, position):
+        return b64encode(
+            json.dumps(position, cls=CursorEncoder).encode()
+        ).decode()
+
+    def decode_cursor(self, cursor, model):
+        if not cursor:
+            return None
+        try:
+            position = json.loads(b64decode(cursor.encode(), validate=True))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                self.convert_position_value(
+                    model._meta.get_field(field.lstrip('-')), value
+                )
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def convert_position_value(self, field, value):
+        if value is None:
+            raise ValueError('Пустое значение в курсоре')
+        value = field.to_python(value)
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            raise ValueError('Дата в курсоре без часового пояса')
+        if isinstance(value, int) and not 0 <= value <= MAX_ID_VALUE:
+            raise ValueError('Число в курсоре вне допустимого диапазона')
+        return field.get_prep_value(value)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.get_position(self.page[-1]))
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
+
+
+class TitleCursorPagination(KeysetPagination):
+    ordering = ('name', 'id')
+
+
+class PubDateCursorPagination(KeysetPagination):
+    ordering = ('-pub_date', '-id')
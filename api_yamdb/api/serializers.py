@@ -1,17 +1,28 @@
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from reviews.constants import (
+    MAX_LENGTH_CHARFIELD,
     MAX_LENGTH_EMAILFIELD,
     MAX_LENGTH_CHARFIELD_NAME,
     MIN_VALUE_SCORE,
     MAX_VALUE_SCORE
 )
-from reviews.models import Comment, Category, Genre, Title, Review, User
+from reviews.models import (
+    Comment,
+    Category,
+    Genre,
+    LeaderboardEntry,
+    Title,
+    Review,
+    User
+)
+from reviews.outbox import queue_email
+from reviews.provisioning import provision_user
 from reviews.validators import validation_username
 
 
@@ -94,23 +105,18 @@ class SignupSerializer(BaseUserSerializer):
         return data
 
     def create(self, validated_data):
-        user, created = User.objects.get_or_create(
+        user, confirmation_code = provision_user(
             username=validated_data['username'],
             email=validated_data['email']
         )
-        confirmation_code = default_token_generator.make_token(user)
-        user.confirmation_code = confirmation_code
-        user.save()
         email_body = (
             f'Доброго времени суток, {user.username}. '
             f'Код подтверждения для доступа к API: {confirmation_code}'
         )
-        send_mail(
+        queue_email(
             subject='Код подтверждения для доступа к API!',
-            message=email_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
+            body=email_body,
+            recipient=user.email
         )
         return user
 
@@ -159,6 +165,48 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
 
+class TitleDetailSerializer(TitleReadSerializer):
+    rating_histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('rating_histogram',)
+
+
+class TitleHistogramSerializer(serializers.ModelSerializer):
+    rating_histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
+
+    class Meta:
+        model = Title
+        fields = ('id', 'rating_histogram')
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='title_id')
+    name = serializers.CharField(source='title.name')
+    year = serializers.IntegerField(source='title.year')
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('id', 'name', 'year', 'weighted_rating', 'reviews_count')
+
+
+class TrendingTitleSerializer(serializers.Serializer):
+    id = serializers.IntegerField(source='title_id')
+    name = serializers.CharField(source='title__name')
+    year = serializers.IntegerField(source='title__year')
+    reviews_count = serializers.IntegerField(source='reviews')
+    average_score = serializers.SerializerMethodField()
+
+    def get_average_score(self, obj):
+        return obj['score'] / obj['reviews']
+
+
 class TitleCreateSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         queryset=Category.objects.all(),
@@ -189,16 +237,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
-    def validate(self, data):
-        if self.context['request'].method == 'POST':
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
             if Review.objects.filter(
-                author=self.context['request'].user,
-                title=self.context['view'].kwargs.get('title_id')
+                author=validated_data['author'],
+                title=validated_data['title']
             ).exists():
-                raise serializers.ValidationError(
-                    'Одно произведение - один отзыв!'
-                )
-        return data
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Одно произведение - один отзыв!'
+                    ]
+                })
+            raise
 
     def validate_score(self, value):
         if MIN_VALUE_SCORE > value > MAX_VALUE_SCORE:
@@ -211,8 +263,26 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = (
             'id', 'text', 'author',
-            'title', 'score', 'pub_date'
+            'title', 'score', 'pub_date', 'comments_count'
         )
+        read_only_fields = ('comments_count',)
+
+
+class ReviewBulkItemSerializer(serializers.Serializer):
+    title = serializers.IntegerField()
+    text = serializers.CharField(max_length=MAX_LENGTH_CHARFIELD)
+    score = serializers.IntegerField(
+        min_value=MIN_VALUE_SCORE,
+        max_value=MAX_VALUE_SCORE,
+        error_messages={
+            'min_value': 'Оценка по 10-бальной шкале!',
+            'max_value': 'Оценка по 10-бальной шкале!'
+        }
+    )
+    author = serializers.CharField(
+        max_length=MAX_LENGTH_CHARFIELD_NAME,
+        required=False
+    )
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -231,3 +301,7 @@ class CommentSerializer(serializers.ModelSerializer):
             'id', 'text', 'author',
             'review', 'pub_date'
         )
+
+
+class CommentCompactSerializer(CommentSerializer):
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -0,0 +1,12 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from api.authentication import user_changed
+from api.cache import catalog_changed
+from reviews.models import Category, Genre, Review, Title, User
+
+for model in (Category, Genre, Review, Title):
+    post_save.connect(catalog_changed, sender=model)
+    post_delete.connect(catalog_changed, sender=model)
+m2m_changed.connect(catalog_changed, sender=Title.genre.through)
+post_save.connect(user_changed, sender=User)
+post_delete.connect(user_changed, sender=User)
@@ -5,10 +5,15 @@ from api.views import (
     CommentViewSet,
     CategoryViewSet,
     GenreViewSet,
+    LeaderboardViewSet,
     TitleViewSet,
+    TrendingViewSet,
     ReviewViewSet,
     UserViewSet,
+    APICacheStats,
+    APIExport,
     APIGetToken,
+    APIReviewBulk,
     APISignup
 )
 
@@ -39,6 +44,16 @@ router_v1.register(
     CommentViewSet,
     basename='comments'
 )
+router_v1.register(
+    r'leaderboards',
+    LeaderboardViewSet,
+    basename='leaderboards'
+)
+router_v1.register(
+    r'trending',
+    TrendingViewSet,
+    basename='trending'
+)
 router_v1.register(
     r'users',
     UserViewSet,
@@ -49,5 +64,8 @@ router_v1.register(
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', APISignup.as_view(), name='signup'),
-    path('v1/auth/token/', APIGetToken.as_view(), name='get_token')
+    path('v1/auth/token/', APIGetToken.as_view(), name='get_token'),
+    path('v1/export/<str:table>/', APIExport.as_view(), name='export'),
+    path('v1/cache/stats/', APICacheStats.as_view(), name='cache_stats'),
+    path('v1/reviews/bulk/', APIReviewBulk.as_view(), name='reviews_bulk')
 ]
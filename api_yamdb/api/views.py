@@ -1,17 +1,26 @@
-from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from api.cache import catalog_changed, get_cache_stats
 from api.filters import TitleFilter
-from api.mixins import ListCreateDestroyViewSet
+from api.mixins import (
+    CatalogCacheMixin,
+    CursorPaginationMixin,
+    LimitMixin,
+    ListCreateDestroyViewSet
+)
+from api.pagination import PubDateCursorPagination, TitleCursorPagination
 from api.permissions import (
     IsAdmin,
     IsAdminModeratorAuthor,
@@ -19,34 +28,166 @@ from api.permissions import (
 )
 from api.serializers import (
     CategorySerializer,
+    CommentCompactSerializer,
     CommentSerializer,
     GenreSerializer,
+    LeaderboardEntrySerializer,
+    ReviewBulkItemSerializer,
     ReviewSerializer,
     TitleCreateSerializer,
+    TitleDetailSerializer,
+    TitleHistogramSerializer,
     TitleReadSerializer,
+    TrendingTitleSerializer,
     TokenSerializer,
     UserEditSerializer,
     UserSerializer,
     SignupSerializer
 )
-from reviews.models import Category, Genre, Title, Review, User
+from reviews.constants import (
+    EXPORT_CHUNK_SIZE,
+    MAX_ID_VALUE,
+    REVIEW_BULK_MAX_SIZE,
+    TITLE_BATCH_MAX_SIZE,
+    TRENDING_WINDOWS
+)
+from reviews.bulk import bulk_create_reviews
+from reviews.exporters import EXPORT_FORMATS, EXPORT_TABLES, iter_export
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    LeaderboardEntry,
+    Title,
+    Review,
+    User,
+    RATING_SCORES,
+    get_score_field
+)
+from reviews.trending import get_trending_titles
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(
+    CatalogCacheMixin,
+    CursorPaginationMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
+    cache_name = 'titles'
     permission_classes = (IsAdminUserOrReadOnly,)
     pagination_class = PageNumberPagination
+    cursor_pagination_class = TitleCursorPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action == 'list':
             return TitleReadSerializer
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
+        if self.action == 'histograms':
+            return TitleHistogramSerializer
         return TitleCreateSerializer
 
+    @action(detail=False, pagination_class=None)
+    def histograms(self, request):
+        ids = request.query_params.get('ids', '')
+        try:
+            ids = {int(pk) for pk in ids.split(',') if pk}
+        except ValueError:
+            raise ValidationError(
+                {'ids': 'Передайте id произведений через запятую'}
+            )
+        if any(not 0 <= pk <= MAX_ID_VALUE for pk in ids):
+            raise ValidationError(
+                {'ids': f'id произведения должен быть от 0 до {MAX_ID_VALUE}'}
+            )
+        if not ids or len(ids) > TITLE_BATCH_MAX_SIZE:
+            raise ValidationError({
+                'ids': 'Передайте от 1 до '
+                f'{TITLE_BATCH_MAX_SIZE} id произведений'
+            })
+        titles = Title.objects.filter(pk__in=ids).order_by('id').only(
+            'id', *map(get_score_field, RATING_SCORES)
+        )
+        return Response(self.get_serializer(titles, many=True).data)
+
+
+class LeaderboardViewSet(
+    CatalogCacheMixin,
+    LimitMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = None
+    cache_name = 'leaderboards'
+    orderings = {
+        'rating': ('-weighted_rating', 'title_id'),
+        'reviews': ('-reviews_count', 'title_id'),
+    }
+
+    def get_queryset(self):
+        order = self.request.query_params.get('order', 'rating')
+        if order not in self.orderings:
+            raise ValidationError(
+                {'order': f'Допустимые значения: {", ".join(self.orderings)}'}
+            )
+        scope, scope_id = self.get_scope()
+        return LeaderboardEntry.objects.filter(
+            scope=scope, scope_id=scope_id, reviews_count__gt=0
+        ).select_related('title').only(
+            'weighted_rating', 'reviews_count', 'title',
+            'title__name', 'title__year'
+        ).order_by(*self.orderings[order])[:self.get_limit()]
+
+    def get_scope(self):
+        params = self.request.query_params
+        scopes = [
+            (scope, model) for scope, model in (
+                (LeaderboardEntry.CATEGORY, Category),
+                (LeaderboardEntry.GENRE, Genre)
+            )
+            if scope in params
+        ]
+        if not scopes:
+            return LeaderboardEntry.ALL, 0
+        if len(scopes) > 1:
+            raise ValidationError('Укажите либо категорию, либо жанр')
+        scope, model = scopes[0]
+        scope_id = model.objects.filter(
+            slug=params[scope]
+        ).values_list('pk', flat=True).first()
+        if scope_id is None:
+            raise NotFound(f'{model._meta.verbose_name}: slug не найден')
+        return scope, scope_id
+
+
+class TrendingViewSet(
+    CatalogCacheMixin,
+    LimitMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    serializer_class = TrendingTitleSerializer
+    pagination_class = None
+    cache_name = 'trending'
+
+    def get_queryset(self):
+        try:
+            days = int(self.request.query_params.get('days', 7))
+        except ValueError:
+            days = None
+        if days not in TRENDING_WINDOWS:
+            raise ValidationError({
+                'days': 'Допустимые значения: '
+                f'{", ".join(map(str, TRENDING_WINDOWS))}'
+            })
+        return get_trending_titles(days, self.get_limit())
+
 
 class GenreViewSet(ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
@@ -68,17 +209,40 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    serializer_class = CommentSerializer
+class CommentViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdminModeratorAuthor,)
+    cursor_pagination_class = PubDateCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
+    def is_compact(self):
+        return self.request.query_params.get(
+            'compact', ''
+        ).lower() in ('1', 'true')
+
+    def get_serializer_class(self):
+        if self.is_compact():
+            return CommentCompactSerializer
+        return CommentSerializer
+
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id')
+        queryset = Comment.objects.filter(
+            review_id=self.kwargs.get('review_id')
+        )
+        if self.is_compact():
+            return queryset.select_related('author').only(
+                'id', 'text', 'pub_date', 'review', 'author',
+                'author__username'
+            )
+        return queryset.select_related('review', 'author').only(
+            'id', 'text', 'pub_date', 'review', 'review__text', 'author',
+            'author__username'
         )
-        return review.comments.all()
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+        return page
 
     def perform_create(self, serializer):
         review = get_object_or_404(
@@ -88,21 +252,29 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminModeratorAuthor,)
+    cursor_pagination_class = PubDateCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_queryset(self):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('title', 'author').only(
+            'id', 'text', 'score', 'pub_date', 'comments_count',
+            'title', 'title__name', 'author', 'author__username'
         )
-        return title.reviews.all()
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return page
 
     def perform_create(self, serializer):
         title = get_object_or_404(
-            Title,
+            Title.objects.only('name'),
             id=self.kwargs.get('title_id')
         )
         serializer.save(author=self.request.user, title=title)
@@ -122,11 +294,12 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def me(self, request):
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
-            serializer = UserSerializer(self.request.user)
+            serializer = UserSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = UserEditSerializer(
-            self.request.user, data=request.data, partial=True)
+            user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save(role=request.user.role, partial=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -176,3 +349,100 @@ class APISignup(APIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class APIExport(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request, table):
+        if table not in EXPORT_TABLES:
+            raise NotFound('Таблица не найдена')
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'output': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}'}
+            )
+        response = StreamingHttpResponse(
+            iter_export(table, output, EXPORT_CHUNK_SIZE),
+            content_type=EXPORT_FORMATS[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{output}"'
+        )
+        return response
+
+
+class APICacheStats(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(get_cache_stats())
+
+
+class APIReviewBulk(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        if not isinstance(request.data, list) or not request.data:
+            raise ValidationError('Передайте непустой список отзывов')
+        if len(request.data) > REVIEW_BULK_MAX_SIZE:
+            raise ValidationError(
+                'За один запрос можно передать не больше '
+                f'{REVIEW_BULK_MAX_SIZE} отзывов'
+            )
+        results = [None] * len(request.data)
+        items = {}
+        for index, data in enumerate(request.data):
+            serializer = ReviewBulkItemSerializer(data=data)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                results[index] = self.get_error(serializer.errors)
+        authors = self.get_authors(items.values())
+        reviews = {}
+        for index, item in items.items():
+            author = authors.get(item.get('author'), request.user)
+            if isinstance(author, str):
+                results[index] = self.get_error({'author': [author]})
+                continue
+            reviews[index] = {
+                'title_id': item['title'],
+                'author': author,
+                'text': item['text'],
+                'score': item['score'],
+            }
+        created = 0
+        for index, review in zip(
+            reviews, bulk_create_reviews(list(reviews.values()))
+        ):
+            if isinstance(review, str):
+                results[index] = self.get_error(
+                    {api_settings.NON_FIELD_ERRORS_KEY: [review]}
+                )
+                continue
+            created += 1
+            results[index] = {
+                'status': status.HTTP_201_CREATED,
+                'id': review.pk
+            }
+        if created:
+            catalog_changed()
+        return Response({'created': created, 'results': results})
+
+    def get_authors(self, items):
+        usernames = {item['author'] for item in items if 'author' in item}
+        if not usernames:
+            return {}
+        if not IsAdmin().has_permission(self.request, self):
+            return {
+                username: 'Указывать автора может только администратор'
+                for username in usernames
+            }
+        users = User.objects.in_bulk(usernames, field_name='username')
+        return {
+            username: users.get(username, 'Пользователь не найден')
+            for username in usernames
+        }
+
+    def get_error(self, errors):
+        return {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TitlesConfig(AppConfig):
     name = 'reviews'
+
+    def ready(self):
+        import reviews.leaderboards  # noqa: F401
+        import reviews.trending  # noqa: F401
+        from reviews.search import create_search_index
+        post_migrate.connect(create_search_index, sender=self)
@@ -0,0 +1,50 @@
+from django.db import IntegrityError, transaction
+
+from reviews.models import Review, Title, add_title_ratings
+
+
+def bulk_create_reviews(items, batch_size=None, retry=True):
+    titles = set(Title.objects.filter(
+        pk__in={item['title_id'] for item in items}
+    ).order_by().values_list('pk', flat=True))
+    taken = set(Review.objects.filter(
+        title_id__in=titles,
+        author_id__in={item['author'].pk for item in items}
+    ).order_by().values_list('title_id', 'author_id'))
+    results = []
+    reviews = []
+    for item in items:
+        key = (item['title_id'], item['author'].pk)
+        if key[0] not in titles:
+            results.append('Произведение не найдено')
+        elif key in taken:
+            results.append('Одно произведение - один отзыв!')
+        else:
+            taken.add(key)
+            reviews.append(Review(**item))
+            results.append(reviews[-1])
+    if not reviews:
+        return results
+    try:
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews, batch_size=batch_size)
+            add_title_ratings(reviews)
+    except IntegrityError:
+        if not retry:
+            raise
+        return bulk_create_reviews(items, batch_size, retry=False)
+    if reviews[0].pk is None:
+        fill_review_ids(reviews)
+    return results
+
+
+def fill_review_ids(reviews):
+    ids = {
+        (title_id, author_id): pk
+        for pk, title_id, author_id in Review.objects.filter(
+            title_id__in={review.title_id for review in reviews},
+            author_id__in={review.author_id for review in reviews}
+        ).order_by().values_list('pk', 'title_id', 'author_id')
+    }
+    for review in reviews:
+        review.pk = ids.get((review.title_id, review.author_id))
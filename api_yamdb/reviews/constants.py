@@ -6,3 +6,27 @@ MAX_LENGTH_TEXTFIELD = 256
 MAX_LENGTH_SLUGFIELD = 50
 MIN_VALUE_SCORE = 0
 MAX_VALUE_SCORE = 10
+IMPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 50000
+MAX_LENGTH_PATH = 512
+EXPORT_CHUNK_SIZE = 2000
+REVIEW_BULK_MAX_SIZE = 100
+TITLE_BATCH_MAX_SIZE = 100
+LEADERBOARD_PRIOR_MEAN = (MIN_VALUE_SCORE + MAX_VALUE_SCORE) / 2
+LEADERBOARD_PRIOR_WEIGHT = 10
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SIZE = 100
+TRENDING_HOURLY_DAYS = 2
+TRENDING_DAILY_DAYS = 30
+TRENDING_WINDOWS = (1, 7, 30)
+TITLE_ORDERING_FIELDS = ('rating', '-rating', 'year', '-year', 'name', '-name')
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 60
+EMAIL_RETRY_MAX_DELAY = 3600
+EMAIL_LEASE_TIME = 300
+MAX_ID_VALUE = 2147483647
+MIN_VALUE_YEAR = -2147483648
+MAX_VALUE_YEAR = 2147483647
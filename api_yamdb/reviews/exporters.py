@@ -0,0 +1,148 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def slug_row(instance):
+    return {
+        'id': instance.id,
+        'name': instance.name,
+        'slug': instance.slug,
+    }
+
+
+def user_row(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'role': user.role,
+        'bio': user.bio,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+    }
+
+
+def title_row(title):
+    return {
+        'id': title.id,
+        'name': title.name,
+        'year': title.year,
+        'description': title.description,
+        'category': title.category_id,
+        'rating': title.rating,
+    }
+
+
+def title_document(title):
+    return {
+        'id': title.id,
+        'name': title.name,
+        'year': title.year,
+        'description': title.description,
+        'category': title.category.slug if title.category else None,
+        'genre': [genre.slug for genre in title.genre.all()],
+        'rating': title.rating,
+    }
+
+
+def genre_title_row(genre_title):
+    return {
+        'id': genre_title.id,
+        'title_id': genre_title.title_id,
+        'genre_id': genre_title.genre_id,
+    }
+
+
+def review_row(review):
+    return {
+        'id': review.id,
+        'title_id': review.title_id,
+        'text': review.text,
+        'author': review.author_id,
+        'score': review.score,
+        'pub_date': review.pub_date.isoformat(),
+    }
+
+
+def comment_row(comment):
+    return {
+        'id': comment.id,
+        'review_id': comment.review_id,
+        'text': comment.text,
+        'author': comment.author_id,
+        'pub_date': comment.pub_date.isoformat(),
+    }
+
+
+EXPORT_TABLES = {
+    'category': (Category.objects.all(), slug_row, None),
+    'genre': (Genre.objects.all(), slug_row, None),
+    'users': (User.objects.all(), user_row, None),
+    'titles': (
+        Title.objects.select_related('category').prefetch_related('genre'),
+        title_row,
+        title_document
+    ),
+    'genre_title': (Title.genre.through.objects.all(), genre_title_row, None),
+    'review': (Review.objects.all(), review_row, None),
+    'comments': (Comment.objects.all(), comment_row, None),
+}
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def iter_queryset_chunks(queryset, chunk_size):
+    last_pk = None
+    while True:
+        chunk = queryset.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def iter_export_rows(table, output, chunk_size):
+    queryset, row, document = EXPORT_TABLES[table]
+    if output == 'ndjson' and document is not None:
+        row = document
+    for chunk in iter_queryset_chunks(queryset.all(), chunk_size):
+        yield [row(instance) for instance in chunk]
+
+
+def iter_export(table, output, chunk_size):
+    if output == 'ndjson':
+        for rows in iter_export_rows(table, output, chunk_size):
+            yield ''.join(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+                + '\n'
+                for row in rows
+            )
+        return
+    writer = csv.writer(Echo())
+    header = None
+    for rows in iter_export_rows(table, output, chunk_size):
+        if header is None:
+            header = list(rows[0])
+            yield writer.writerow(header)
+        yield ''.join(
+            writer.writerow([
+                '' if row[column] is None else row[column]
+                for column in header
+            ])
+            for row in rows
+        )
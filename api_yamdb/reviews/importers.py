@@ -0,0 +1,264 @@
+import csv
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    ImportCheckpoint,
+    Review,
+    Title,
+    User
+)
+
+IMPORT_TABLES = (
+    ('category', Category, {}),
+    ('genre', Genre, {}),
+    ('users', User, {}),
+    ('titles', Title, {'category': 'category_id', 'rating': None}),
+    ('genre_title', Title.genre.through, {}),
+    ('review', Review, {'author': 'author_id'}),
+    ('comments', Comment, {'author': 'author_id'}),
+)
+
+
+class ImportFileError(Exception):
+    pass
+
+
+class OffsetLineReader:
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+
+def match_table(path):
+    stem = path.stem
+    for table, model, columns in sorted(
+        IMPORT_TABLES, key=lambda item: len(item[0]), reverse=True
+    ):
+        if stem == table or stem.startswith((f'{table}_', f'{table}-')):
+            return table, model, columns
+    return None
+
+
+def find_import_files(paths):
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.csv')))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise ImportFileError(f'{path}: файл не найден')
+    order = [table for table, _, _ in IMPORT_TABLES]
+    matched = []
+    for file in files:
+        table = match_table(file)
+        if table is None:
+            raise ImportFileError(
+                f'{file}: не удалось определить таблицу по имени файла'
+            )
+        matched.append((file.resolve(), *table[1:], order.index(table[0])))
+    matched.sort(key=lambda item: (item[3], str(item[0])))
+    return [item[:3] for item in matched]
+
+
+def iter_batches(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def build_instance(model, row, columns):
+    values = {}
+    for column, value in row.items():
+        name = columns.get(column, column)
+        if name is None:
+            continue
+        field = model._meta.get_field(name)
+        if value == '' and field.null:
+            value = None
+        values[name] = field.to_python(value)
+    instance = model(**values)
+    if model is User:
+        instance.set_unusable_password()
+    return instance
+
+
+@contextmanager
+def keep_auto_now_values(model, columns):
+    fields = [
+        field for field in model._meta.local_fields
+        if getattr(field, 'auto_now_add', False) and field.name in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def get_import_key(model, fieldnames):
+    for key in ('id', 'slug'):
+        if key in fieldnames:
+            return key
+    raise ImportFileError(
+        f'{model._meta.db_table}: для сверки нужен столбец id или slug'
+    )
+
+
+def get_update_fields(model, fieldnames, columns, key):
+    return [
+        model._meta.get_field(columns.get(column, column)).attname
+        for column in fieldnames
+        if column not in ('id', key) and columns.get(column, column)
+    ]
+
+
+def upsert_instances(model, instances, key, fields, batch_size):
+    existing = model.objects.in_bulk(
+        [getattr(instance, key) for instance in instances],
+        field_name=key
+    )
+    created = []
+    changed = []
+    for instance in instances:
+        current = existing.get(getattr(instance, key))
+        if current is None:
+            created.append(instance)
+        elif any(
+            getattr(current, field) != getattr(instance, field)
+            for field in fields
+        ):
+            instance.pk = current.pk
+            changed.append(instance)
+    model.objects.bulk_create(created, batch_size=batch_size)
+    if changed and fields:
+        model.objects.bulk_update(changed, fields, batch_size=batch_size)
+    return Counter(
+        inserted=len(created),
+        updated=len(changed),
+        skipped=len(instances) - len(created) - len(changed)
+    )
+
+
+def delete_missing(model, seen, batch_size):
+    keys = list(seen)
+    missing = [
+        values[0]
+        for values in model.objects.values_list('pk', *keys).iterator()
+        if not any(
+            value in seen[key] for key, value in zip(keys, values[1:])
+        )
+    ]
+    for batch in iter_batches(missing, batch_size):
+        model.objects.filter(pk__in=batch).delete()
+    return len(missing)
+
+
+def get_checkpoint(path):
+    size = path.stat().st_size
+    checkpoint, created = ImportCheckpoint.objects.get_or_create(
+        path=str(path),
+        defaults={'size': size}
+    )
+    if checkpoint.size != size:
+        raise ImportFileError(
+            f'{path}: файл изменился после прерванного импорта, '
+            'запустите импорт с --restart'
+        )
+    return checkpoint
+
+
+@contextmanager
+def open_csv(path, offset=0):
+    with open(path, 'rb') as file:
+        lines = OffsetLineReader(file)
+        header = next(csv.reader(lines), None)
+        if header is None:
+            yield lines, None
+            return
+        header[0] = header[0].lstrip('\ufeff')
+        if offset > lines.offset:
+            file.seek(offset)
+            lines.offset = offset
+        yield lines, csv.DictReader(lines, fieldnames=header)
+
+
+def import_csv(path, model, columns, batch_size, chunk_size,
+               upsert=False, seen=None):
+    checkpoint = get_checkpoint(path)
+    if checkpoint.completed:
+        return
+    with open_csv(path, checkpoint.offset) as (lines, reader):
+        if reader is None:
+            checkpoint.completed = True
+            checkpoint.save()
+            return
+        if upsert:
+            key = get_import_key(model, reader.fieldnames)
+            fields = get_update_fields(
+                model, reader.fieldnames, columns, key
+            )
+        with keep_auto_now_values(model, reader.fieldnames):
+            for chunk in iter_batches(reader, chunk_size):
+                try:
+                    instances = [
+                        build_instance(model, row, columns) for row in chunk
+                    ]
+                except ValidationError as error:
+                    raise ImportFileError(
+                        f'{path}: {" ".join(error.messages)}'
+                    )
+                with transaction.atomic():
+                    if upsert:
+                        stats = upsert_instances(
+                            model, instances, key, fields, batch_size
+                        )
+                    else:
+                        model.objects.bulk_create(
+                            instances, batch_size=batch_size
+                        )
+                        stats = Counter(inserted=len(instances))
+                    checkpoint.offset = lines.offset
+                    checkpoint.last_id = chunk[-1].get('id') or ''
+                    checkpoint.rows += len(chunk)
+                    checkpoint.save()
+                if seen is not None:
+                    seen.setdefault(key, set()).update(
+                        getattr(instance, key) for instance in instances
+                    )
+                yield checkpoint, stats
+    checkpoint.completed = True
+    checkpoint.save()
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import (
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery
+)
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.constants import (
+    IMPORT_BATCH_SIZE,
+    LEADERBOARD_PRIOR_MEAN,
+    LEADERBOARD_PRIOR_WEIGHT
+)
+from reviews.models import (
+    Category,
+    Genre,
+    LeaderboardEntry,
+    Title,
+    title_ratings_changed
+)
+
+
+def get_weighted_rating(rating_sum, rating_count):
+    return (
+        (rating_sum + LEADERBOARD_PRIOR_WEIGHT * LEADERBOARD_PRIOR_MEAN)
+        / (rating_count + LEADERBOARD_PRIOR_WEIGHT)
+    )
+
+
+def get_weighted_rating_expression():
+    return ExpressionWrapper(
+        (
+            F('rating_sum')
+            + LEADERBOARD_PRIOR_WEIGHT * LEADERBOARD_PRIOR_MEAN
+        ) / (F('rating_count') + LEADERBOARD_PRIOR_WEIGHT * 1.0),
+        output_field=FloatField()
+    )
+
+
+def build_leaderboard_entries(title_id, category_id, genre_ids,
+                              rating_sum, rating_count):
+    scopes = [(LeaderboardEntry.ALL, 0)]
+    if category_id is not None:
+        scopes.append((LeaderboardEntry.CATEGORY, category_id))
+    scopes.extend((LeaderboardEntry.GENRE, genre_id) for genre_id in genre_ids)
+    weighted_rating = get_weighted_rating(rating_sum, rating_count)
+    return [
+        LeaderboardEntry(
+            scope=scope,
+            scope_id=scope_id,
+            title_id=title_id,
+            weighted_rating=weighted_rating,
+            reviews_count=rating_count
+        )
+        for scope, scope_id in scopes
+    ]
+
+
+def sync_title_leaderboards(title_id):
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(title_id=title_id).delete()
+        title = Title.objects.filter(pk=title_id).values_list(
+            'category_id', 'rating_sum', 'rating_count'
+        ).first()
+        if title is None:
+            return
+        genre_ids = Title.genre.through.objects.filter(
+            title_id=title_id
+        ).values_list('genre_id', flat=True)
+        category_id, rating_sum, rating_count = title
+        LeaderboardEntry.objects.bulk_create(build_leaderboard_entries(
+            title_id, category_id, genre_ids, rating_sum, rating_count
+        ))
+
+
+def rebuild_leaderboards(batch_size=IMPORT_BATCH_SIZE):
+    genres = defaultdict(list)
+    for title_id, genre_id in Title.genre.through.objects.order_by(
+        'title_id'
+    ).values_list('title_id', 'genre_id').iterator():
+        genres[title_id].append(genre_id)
+    entries = (
+        entry
+        for title_id, category_id, rating_sum, rating_count
+        in Title.objects.order_by('pk').values_list(
+            'pk', 'category_id', 'rating_sum', 'rating_count'
+        ).iterator()
+        for entry in build_leaderboard_entries(
+            title_id, category_id, genres[title_id], rating_sum, rating_count
+        )
+    )
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        batch = list(islice(entries, batch_size))
+        while batch:
+            LeaderboardEntry.objects.bulk_create(batch)
+            batch = list(islice(entries, batch_size))
+
+
+def refresh_leaderboards(title_ids):
+    titles = Title.objects.filter(pk=OuterRef('title_id'))
+    LeaderboardEntry.objects.filter(title_id__in=title_ids).update(
+        weighted_rating=Subquery(titles.annotate(
+            value=get_weighted_rating_expression()
+        ).values('value')),
+        reviews_count=Subquery(titles.values('rating_count'))
+    )
+
+
+@receiver(post_save, sender=Title)
+def title_post_save(sender, instance, **kwargs):
+    sync_title_leaderboards(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        sync_title_leaderboards(instance.pk)
+    elif pk_set is None:
+        LeaderboardEntry.objects.filter(
+            scope=LeaderboardEntry.GENRE, scope_id=instance.pk
+        ).delete()
+    else:
+        for title_id in pk_set:
+            sync_title_leaderboards(title_id)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def leaderboard_scope_post_delete(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(
+        scope=sender._meta.model_name, scope_id=instance.pk
+    ).delete()
+
+
+@receiver(title_ratings_changed, sender=Title)
+def title_ratings_post_change(sender, title_ids, **kwargs):
+    refresh_leaderboards(title_ids)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from reviews.trending import compact_title_activity, rebuild_title_activity
+
+
+class Command(BaseCommand):
+    help = (
+        'Объединяет почасовые счётчики активности в дневные и удаляет '
+        'устаревшие'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Пересчитать счётчики заново по датам отзывов'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rebuild_title_activity()
+            self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
+            return
+        merged, expired = compact_title_activity()
+        self.stdout.write(self.style.SUCCESS(
+            f'Объединено почасовых счётчиков: {merged}, '
+            f'удалено устаревших: {expired}'
+        ))
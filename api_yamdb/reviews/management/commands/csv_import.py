@@ -1,29 +1,136 @@
-import csv
-from pathlib import Path
+import time
+from collections import Counter
+from itertools import groupby
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-from reviews.models import Category, Comment, Genre, Title, Review, User
+from reviews.constants import IMPORT_BATCH_SIZE, IMPORT_CHUNK_SIZE
+from reviews.importers import (
+    ImportFileError,
+    delete_missing,
+    find_import_files,
+    import_csv,
+    reset_sequences
+)
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import (
+    Comment,
+    ImportCheckpoint,
+    Review,
+    Title,
+    recalculate_comments_counts,
+    recalculate_title_ratings
+)
+from reviews.trending import rebuild_title_activity
 
 
 class Command(BaseCommand):
+    help = 'Импортирует данные из CSV-файлов с учётом связей между таблицами'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            default=[settings.BASE_DIR / 'static' / 'data'],
+            help='CSV-файлы или папки с ними'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество строк в одном INSERT'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help='Количество строк в одной транзакции'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать импорт заново, не используя контрольные точки'
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help=(
+                'Сверять строки с базой по id или slug: добавлять новые и '
+                'обновлять изменённые'
+            )
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help=(
+                'Вместе с --upsert удалять записи, которых нет в файлах; '
+                'импорт всегда начинается заново'
+            )
+        )
 
     def handle(self, *args, **options):
-        path = Path('./static/data')
-        for file in path.iterdir():
-            with open(file, encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if file.name == 'category.csv':
-                        Category.objects.create(**row)
-                    elif file.name == 'genre.csv':
-                        Genre.objects.create(**row)
-                    elif file.name == 'users.csv':
-                        User.objects.create(**row)
-                    elif file.name == 'titles.csv':
-                        Title.objects.create(**row)
-                    elif file.name == 'review.csv':
-                        Review.objects.create(**row)
-                    elif file.name == 'comments.csv':
-                        Comment.objects.create(**row)
+        if options['delete_missing'] and not options['upsert']:
+            raise CommandError('--delete-missing работает только с --upsert')
+        try:
+            files = find_import_files(options['paths'])
+        except ImportFileError as error:
+            raise CommandError(error)
+        paths = [str(path) for path, _, _ in files]
+        if options['restart'] or options['delete_missing']:
+            ImportCheckpoint.objects.filter(path__in=paths).delete()
+        loaded = self.import_tables(files, options)
+        reset_sequences(loaded)
+        if Review in loaded:
+            recalculate_title_ratings()
+            rebuild_title_activity()
+        if loaded & {Review, Comment}:
+            recalculate_comments_counts()
+        if loaded & {Title, Title.genre.through, Review}:
+            rebuild_leaderboards()
+        ImportCheckpoint.objects.filter(path__in=paths).delete()
         self.stdout.write(self.style.SUCCESS('Данные импортированы'))
+
+    def import_tables(self, files, options):
+        loaded = set()
+        for model, table_files in groupby(files, key=lambda file: file[1]):
+            stats = Counter()
+            seen = {} if options['delete_missing'] else None
+            for path, _, columns in table_files:
+                stats += self.import_file(path, model, columns, seen, options)
+            if seen:
+                stats['deleted'] = delete_missing(
+                    model, seen, options['batch_size']
+                )
+            loaded.add(model)
+            self.stdout.write(
+                f'{model._meta.db_table}: '
+                f'добавлено {stats["inserted"]}, '
+                f'обновлено {stats["updated"]}, '
+                f'пропущено {stats["skipped"]}, '
+                f'удалено {stats["deleted"]}'
+            )
+        return loaded
+
+    def import_file(self, path, model, columns, seen, options):
+        size = path.stat().st_size or 1
+        started = time.monotonic()
+        stats = Counter()
+        rows = 0
+        try:
+            for checkpoint, chunk_stats in import_csv(
+                path, model, columns,
+                options['batch_size'], options['chunk_size'],
+                upsert=options['upsert'], seen=seen
+            ):
+                stats += chunk_stats
+                rows += sum(chunk_stats.values())
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'{path.name}: {checkpoint.rows} строк, '
+                    f'{checkpoint.offset * 100 // size}% '
+                    f'({rows / elapsed if elapsed else rows:.0f} строк/с)'
+                )
+        except ImportFileError as error:
+            raise CommandError(error)
+        return stats
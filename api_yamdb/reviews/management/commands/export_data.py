@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import EXPORT_CHUNK_SIZE
+from reviews.exporters import EXPORT_FORMATS, EXPORT_TABLES, iter_export
+
+
+class Command(BaseCommand):
+    help = 'Выгружает каталог, отзывы и комментарии в CSV или NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Папка для выгрузки'
+        )
+        parser.add_argument(
+            '--output',
+            choices=EXPORT_FORMATS,
+            default='csv',
+            help='Формат выгрузки; CSV можно загрузить обратно csv_import'
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=EXPORT_TABLES,
+            default=list(EXPORT_TABLES),
+            help='Выгружаемые таблицы'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один запрос'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        path.mkdir(parents=True, exist_ok=True)
+        output = options['output']
+        for table in options['tables']:
+            started = time.monotonic()
+            file = path / f'{table}.{output}'
+            with open(file, 'w', encoding='utf-8', newline='') as stream:
+                for data in iter_export(
+                    table, output, options['chunk_size']
+                ):
+                    stream.write(data)
+            elapsed = time.monotonic() - started
+            rows = EXPORT_TABLES[table][0].count()
+            self.stdout.write(
+                f'{file.name}: {rows} строк за {elapsed:.2f} с '
+                f'({rows / elapsed if elapsed else rows:.0f} строк/с)'
+            )
+        self.stdout.write(self.style.SUCCESS('Данные выгружены'))
@@ -0,0 +1,267 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.constants import (
+    IMPORT_BATCH_SIZE,
+    MAX_VALUE_SCORE,
+    MIN_VALUE_SCORE
+)
+from reviews.importers import (
+    iter_batches,
+    keep_auto_now_values,
+    reset_sequences
+)
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    User,
+    recalculate_comments_counts,
+    recalculate_title_ratings
+)
+from reviews.trending import rebuild_title_activity
+
+WORDS = (
+    'сюжет', 'герой', 'финал', 'автор', 'атмосфера', 'музыка', 'диалоги',
+    'персонажи', 'идея', 'ритм', 'отличный', 'скучный', 'неожиданный',
+    'сильный', 'слабый', 'красивый', 'затянутый', 'смешной', 'мрачный',
+    'рекомендую', 'пересмотрю', 'перечитаю', 'не', 'очень', 'немного',
+)
+
+COUNT_OPTIONS = {
+    'users': 1000,
+    'categories': 5,
+    'genres': 20,
+    'titles': 1000,
+    'reviews': 10000,
+    'comments': 10000,
+}
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+
+def split_skewed(total, buckets, cap, skew, rng):
+    weights = [1 / rank ** skew for rank in range(1, buckets + 1)]
+    rng.shuffle(weights)
+    weight_sum = sum(weights)
+    counts = [min(cap, int(total * weight / weight_sum)) for weight in weights]
+    remainder = total - sum(counts)
+    order = sorted(range(buckets), key=lambda index: -weights[index])
+    while remainder > 0:
+        for index in order:
+            if remainder == 0:
+                break
+            if counts[index] < cap:
+                counts[index] += 1
+                remainder -= 1
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Создаёт большой набор тестовых данных с воспроизводимым seed'
+
+    def add_arguments(self, parser):
+        for name, default in COUNT_OPTIONS.items():
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Количество записей {name}'
+            )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для отзывов по произведениям'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='За сколько последних дней распределить даты публикации'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.options = options
+        for name, generate in (
+            ('categories', self.generate_categories),
+            ('genres', self.generate_genres),
+            ('users', self.generate_users),
+            ('titles', self.generate_titles),
+            ('genre_title', self.generate_genre_titles),
+            ('reviews', self.generate_reviews),
+            ('comments', self.generate_comments),
+        ):
+            started = time.monotonic()
+            with transaction.atomic():
+                count = self.bulk_create(*generate())
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{name}: {count} строк за {elapsed:.2f} с '
+                f'({count / elapsed if elapsed else count:.0f} строк/с)'
+            )
+        reset_sequences(
+            [Category, Genre, User, Title, Title.genre.through, Review,
+             Comment]
+        )
+        recalculate_title_ratings()
+        recalculate_comments_counts()
+        rebuild_leaderboards(self.options['batch_size'])
+        rebuild_title_activity()
+        self.stdout.write(self.style.SUCCESS('Данные созданы'))
+
+    def check_options(self, options):
+        for name in COUNT_OPTIONS:
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть отрицательным')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным')
+        if options['reviews'] and not options['titles']:
+            raise CommandError('Для отзывов нужны произведения')
+        if options['reviews'] and not options['users']:
+            raise CommandError('Для отзывов нужны пользователи')
+        if options['reviews'] > options['titles'] * options['users']:
+            raise CommandError(
+                'Отзывов больше, чем пар произведение-автор'
+            )
+        if options['comments'] and not options['reviews']:
+            raise CommandError('Для комментариев нужны отзывы')
+
+    def bulk_create(self, model, instances):
+        count = 0
+        with keep_auto_now_values(model, ('pub_date',)):
+            for batch in iter_batches(instances, self.options['batch_size']):
+                model.objects.bulk_create(batch)
+                count += len(batch)
+        return count
+
+    def random_date(self):
+        return self.now - timedelta(
+            seconds=self.rng.random() * self.options['days'] * 86400
+        )
+
+    def random_text(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def generate_categories(self):
+        start = next_id(Category)
+        self.category_ids = list(
+            range(start, start + self.options['categories'])
+        )
+        return Category, (
+            Category(id=pk, name=f'Категория {pk}', slug=f'fake-category-{pk}')
+            for pk in self.category_ids
+        )
+
+    def generate_genres(self):
+        start = next_id(Genre)
+        self.genre_ids = list(range(start, start + self.options['genres']))
+        return Genre, (
+            Genre(id=pk, name=f'Жанр {pk}', slug=f'fake-genre-{pk}')
+            for pk in self.genre_ids
+        )
+
+    def generate_users(self):
+        start = next_id(User)
+        self.user_ids = range(start, start + self.options['users'])
+        password = make_password(None)
+        return User, (
+            User(
+                id=pk,
+                username=f'fake_user_{pk}',
+                email=f'fake_user_{pk}@yamdb.fake',
+                password=password
+            )
+            for pk in self.user_ids
+        )
+
+    def generate_titles(self):
+        start = next_id(Title)
+        self.title_ids = range(start, start + self.options['titles'])
+        year = self.now.year
+        return Title, (
+            Title(
+                id=pk,
+                name=f'{self.random_text(2)} {pk}',
+                year=self.rng.randint(1900, year),
+                description=self.random_text(12),
+                category_id=(
+                    self.rng.choice(self.category_ids)
+                    if self.category_ids else None
+                )
+            )
+            for pk in self.title_ids
+        )
+
+    def generate_genre_titles(self):
+        return Title.genre.through, (
+            Title.genre.through(title_id=pk, genre_id=genre_id)
+            for pk in self.title_ids
+            for genre_id in self.rng.sample(
+                self.genre_ids,
+                min(len(self.genre_ids), self.rng.randint(1, 3))
+            )
+        )
+
+    def generate_reviews(self):
+        counts = split_skewed(
+            self.options['reviews'],
+            len(self.title_ids),
+            len(self.user_ids),
+            self.options['skew'],
+            self.rng
+        )
+        start = next_id(Review)
+        self.review_ids = range(start, start + self.options['reviews'])
+        return Review, self.iter_reviews(start, counts)
+
+    def iter_reviews(self, start, counts):
+        pk = start
+        for title_id, count in zip(self.title_ids, counts):
+            mean = self.rng.uniform(MIN_VALUE_SCORE + 2, MAX_VALUE_SCORE - 1)
+            for author_id in self.rng.sample(self.user_ids, count):
+                yield Review(
+                    id=pk,
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=self.random_text(20),
+                    score=min(MAX_VALUE_SCORE, max(
+                        MIN_VALUE_SCORE, round(self.rng.gauss(mean, 2))
+                    )),
+                    pub_date=self.random_date()
+                )
+                pk += 1
+
+    def generate_comments(self):
+        start = next_id(Comment)
+        return Comment, (
+            Comment(
+                id=pk,
+                review_id=self.rng.choice(self.review_ids),
+                author_id=self.rng.choice(self.user_ids),
+                text=self.random_text(8),
+                pub_date=self.random_date()
+            )
+            for pk in range(start, start + self.options['comments'])
+        )
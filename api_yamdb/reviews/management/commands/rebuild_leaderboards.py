@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import IMPORT_BATCH_SIZE
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает рейтинги лучших произведений: общий, по категориям '
+        'и по жанрам'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество строк в одном INSERT'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rebuild_leaderboards(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Записано {LeaderboardEntry.objects.count()} позиций за '
+            f'{time.monotonic() - started:.2f} с'
+        ))
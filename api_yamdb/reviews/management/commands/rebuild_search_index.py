@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_search_index, search_index_supported
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений'
+
+    def handle(self, *args, **options):
+        if not search_index_supported():
+            self.stdout.write(
+                self.style.WARNING('Полнотекстовый индекс доступен для SQLite')
+            )
+            return
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
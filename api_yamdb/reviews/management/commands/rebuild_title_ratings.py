@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import IMPORT_BATCH_SIZE
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import recalculate_title_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги и гистограммы оценок всех произведений '
+        'за один проход по отзывам'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество произведений в одном UPDATE'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        recalculate_title_ratings(batch_size=options['batch_size'])
+        rebuild_leaderboards(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны за {time.monotonic() - started:.2f} с'
+        ))
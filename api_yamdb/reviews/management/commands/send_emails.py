@@ -0,0 +1,54 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import EMAIL_BATCH_SIZE
+from reviews.outbox import send_pending_emails
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Количество потоков отправки'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help='Количество писем на одно соединение с почтовым сервером'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить письма, готовые к отправке, и завершить работу'
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(options['workers']) as executor:
+            while True:
+                stats = send_pending_emails(
+                    executor, options['batch_size'], options['workers']
+                )
+                if stats:
+                    self.stdout.write(
+                        f'отправлено {stats["sent"]}, '
+                        f'отложено {stats["retried"]}, '
+                        f'не доставлено {stats["failed"]}'
+                    )
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('Очередь писем обработана'))
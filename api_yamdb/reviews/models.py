@@ -1,4 +1,7 @@
+from collections import Counter, defaultdict
 from datetime import datetime
+from itertools import groupby, islice
+from threading import local
 
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.tokens import default_token_generator
@@ -6,17 +9,29 @@ from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
     validate_slug)
-from django.db import models
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery
+)
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
 
 from reviews.constants import (
+    IMPORT_BATCH_SIZE,
     MAX_LENGTH_CHARFIELD,
     MAX_LENGTH_EMAILFIELD,
     MAX_LENGTH_SLUGFIELD,
     MAX_LENGTH_TEXTFIELD,
     MAX_LENGTH_CHARFIELD_NAME,
     MAX_LENGTH_CHARFIELD_ROLE,
+    MAX_LENGTH_PATH,
     MIN_VALUE_SCORE,
     MAX_VALUE_SCORE
 )
@@ -101,16 +116,6 @@ class User(AbstractUser):
         return self.username
 
 
-@receiver(post_save, sender=User)
-def post_save(sender, instance, created, **kwargs):
-    if created:
-        confirmation_code = default_token_generator.make_token(
-            instance
-        )
-        instance.confirmation_code = confirmation_code
-        instance.save()
-
-
 class Category(models.Model):
     name = models.CharField(
         verbose_name='Название категории',
@@ -153,6 +158,41 @@ class Genre(models.Model):
         return self.name
 
 
+def get_score_field(score):
+    return f'score_{score}_count'
+
+
+RATING_SCORES = range(MIN_VALUE_SCORE, MAX_VALUE_SCORE + 1)
+RATING_COUNTERS = (
+    'rating_sum',
+    'rating_count',
+    *map(get_score_field, RATING_SCORES)
+)
+RATING_FIELDS = ('rating', *RATING_COUNTERS)
+
+title_ratings_changed = Signal()
+
+deletions = local()
+
+
+def get_deletions():
+    if not hasattr(deletions, 'titles'):
+        deletions.titles = set()
+        deletions.reviews = set()
+        deletions.authors = {}
+    return deletions
+
+
+def get_save_fields(instance, counters):
+    deferred = instance.get_deferred_fields()
+    return [
+        field.attname for field in instance._meta.concrete_fields
+        if not field.primary_key
+        and field.attname not in deferred
+        and field.name not in counters
+    ]
+
+
 class Title(models.Model):
     name = models.CharField(
         verbose_name='Название произведения',
@@ -180,15 +220,122 @@ class Title(models.Model):
         null=True,
         related_name='titles'
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True
+    )
+    score_0_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 0',
+        default=0
+    )
+    score_1_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 1',
+        default=0
+    )
+    score_2_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 2',
+        default=0
+    )
+    score_3_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 3',
+        default=0
+    )
+    score_4_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 4',
+        default=0
+    )
+    score_5_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 5',
+        default=0
+    )
+    score_6_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 6',
+        default=0
+    )
+    score_7_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 7',
+        default=0
+    )
+    score_8_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 8',
+        default=0
+    )
+    score_9_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 9',
+        default=0
+    )
+    score_10_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок 10',
+        default=0
+    )
 
     class Meta:
         ordering = ['-year']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(fields=['rating', 'id'], name='title_rating_id_idx'),
+            models.Index(fields=['year', 'id'], name='title_year_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = get_save_fields(self, RATING_FIELDS)
+        super().save(*args, **kwargs)
+
+    @property
+    def rating_histogram(self):
+        return {
+            score: getattr(self, get_score_field(score))
+            for score in RATING_SCORES
+        }
+
+
+def update_title_counters(title_id, added=(), removed=()):
+    buckets = Counter(added)
+    buckets.subtract(removed)
+    score_delta = sum(added) - sum(removed)
+    count_delta = len(added) - len(removed)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        rating=ExpressionWrapper(
+            (F('rating_sum') + score_delta)
+            / NullIf(F('rating_count') + count_delta * 1.0, 0),
+            output_field=FloatField()
+        ),
+        **{
+            get_score_field(score): F(get_score_field(score)) + delta
+            for score, delta in buckets.items()
+            if delta
+        }
+    )
+
+
+def update_title_rating(title_id, added=(), removed=(), pub_date=None):
+    update_title_counters(title_id, added, removed)
+    title_ratings_changed.send(
+        sender=Title,
+        title_ids=[title_id],
+        rows=[] if pub_date is None else [(
+            title_id, pub_date, len(added) - len(removed),
+            sum(added) - sum(removed)
+        )]
+    )
+
 
 class Review(models.Model):
     text = models.TextField(
@@ -218,6 +365,10 @@ class Review(models.Model):
         verbose_name='Дата отзыва',
         auto_now_add=True
     )
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0
+    )
 
     class Meta:
         ordering = ['-pub_date']
@@ -229,10 +380,151 @@ class Review(models.Model):
                 name='unique_review'
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Review.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('title_id', 'score').first()
+            if previous is not None and kwargs.get('update_fields') is None:
+                kwargs['update_fields'] = get_save_fields(
+                    self, ('comments_count',)
+                )
+            super().save(*args, **kwargs)
+            if previous is None:
+                update_title_rating(
+                    self.title_id, added=[self.score], pub_date=self.pub_date
+                )
+            elif previous[0] != self.title_id:
+                update_title_rating(
+                    previous[0], removed=[previous[1]], pub_date=self.pub_date
+                )
+                update_title_rating(
+                    self.title_id, added=[self.score], pub_date=self.pub_date
+                )
+            elif previous[1] != self.score:
+                update_title_rating(
+                    self.title_id, added=[self.score], removed=[previous[1]],
+                    pub_date=self.pub_date
+                )
+
+
+@receiver(pre_delete, sender=Title)
+def title_pre_delete(sender, instance, **kwargs):
+    get_deletions().titles.add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def title_post_delete(sender, instance, **kwargs):
+    get_deletions().titles.discard(instance.pk)
+
+
+@receiver(pre_delete, sender=Review)
+def review_pre_delete(sender, instance, **kwargs):
+    get_deletions().reviews.add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def review_post_delete(sender, instance, **kwargs):
+    state = get_deletions()
+    state.reviews.discard(instance.pk)
+    if instance.title_id in state.titles:
+        return
+    if instance.author_id in state.authors:
+        state.authors[instance.author_id][0].append(instance)
+        return
+    update_title_rating(
+        instance.title_id, removed=[instance.score], pub_date=instance.pub_date
+    )
+
+
+@receiver(pre_delete, sender=User)
+def user_pre_delete(sender, instance, **kwargs):
+    get_deletions().authors[instance.pk] = ([], Counter())
+
+
+@receiver(post_delete, sender=User)
+def user_post_delete(sender, instance, **kwargs):
+    reviews, comments = get_deletions().authors.pop(instance.pk, ([], {}))
+    remove_title_ratings(reviews)
+    remove_review_comments(comments)
+
+
+def recalculate_title_ratings(titles=None, batch_size=IMPORT_BATCH_SIZE):
+    reviews = Review.objects.all()
+    if titles is None:
+        titles = Title.objects.all()
+    else:
+        reviews = reviews.filter(title__in=titles)
+    counts = reviews.order_by('title_id', 'score').values_list(
+        'title_id', 'score'
+    ).annotate(total=Count('id'))
+    with transaction.atomic():
+        titles.update(
+            rating=None, **{field: 0 for field in RATING_COUNTERS}
+        )
+        rated = (
+            build_title_rating(title_id, rows)
+            for title_id, rows in groupby(
+                counts.iterator(), key=lambda row: row[0]
+            )
+        )
+        batch = list(islice(rated, batch_size))
+        while batch:
+            Title.objects.bulk_update(batch, RATING_FIELDS)
+            batch = list(islice(rated, batch_size))
+
+
+def build_title_rating(title_id, rows):
+    title = Title(id=title_id)
+    for _, score, total in rows:
+        title.rating_sum += score * total
+        title.rating_count += total
+        setattr(title, get_score_field(score), total)
+    if title.rating_count:
+        title.rating = title.rating_sum / title.rating_count
+    return title
+
+
+def add_title_ratings(reviews):
+    change_title_ratings(reviews, 1)
+
+
+def remove_title_ratings(reviews):
+    change_title_ratings(reviews, -1)
+
+
+def change_title_ratings(reviews, sign):
+    if not reviews:
+        return
+    scores = defaultdict(list)
+    for review in reviews:
+        scores[review.title_id].append(review.score)
+    for title_id, changed in scores.items():
+        if sign > 0:
+            update_title_counters(title_id, added=changed)
+        else:
+            update_title_counters(title_id, removed=changed)
+    title_ratings_changed.send(
+        sender=Title,
+        title_ids=list(scores),
+        rows=[
+            (review.title_id, review.pub_date, sign, sign * review.score)
+            for review in reviews
+        ]
+    )
+
 
 class Comment(models.Model):
     text = models.TextField(
@@ -260,6 +552,288 @@ class Comment(models.Model):
         ordering = ['-pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Comment.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('review_id', flat=True).first()
+            super().save(*args, **kwargs)
+            if previous != self.review_id:
+                if previous is not None:
+                    update_review_comments_count(previous, -1)
+                update_review_comments_count(self.review_id, 1)
+
+
+def update_review_comments_count(review_id, delta):
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_post_delete(sender, instance, **kwargs):
+    state = get_deletions()
+    if instance.review_id in state.reviews:
+        return
+    if instance.author_id in state.authors:
+        state.authors[instance.author_id][1][instance.review_id] += 1
+        return
+    update_review_comments_count(instance.review_id, -1)
+
+
+def remove_review_comments(counts):
+    reviews = defaultdict(list)
+    for review_id, total in counts.items():
+        reviews[total].append(review_id)
+    for total, review_ids in reviews.items():
+        Review.objects.filter(pk__in=review_ids).update(
+            comments_count=F('comments_count') - total
+        )
+
+
+def recalculate_comments_counts(reviews=None):
+    if reviews is None:
+        reviews = Review.objects.all()
+    reviews.update(
+        comments_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    review=OuterRef('pk')
+                ).order_by().values('review').annotate(
+                    total=Count('id')
+                ).values('total')
+            ),
+            0
+        )
+    )
+
+
+class ImportCheckpoint(models.Model):
+    path = models.CharField(
+        verbose_name='Файл',
+        max_length=MAX_LENGTH_PATH,
+        unique=True
+    )
+    size = models.BigIntegerField(
+        verbose_name='Размер файла'
+    )
+    offset = models.BigIntegerField(
+        verbose_name='Смещение',
+        default=0
+    )
+    last_id = models.CharField(
+        verbose_name='Последний id',
+        max_length=MAX_LENGTH_CHARFIELD,
+        blank=True
+    )
+    rows = models.BigIntegerField(
+        verbose_name='Загружено строк',
+        default=0
+    )
+    completed = models.BooleanField(
+        verbose_name='Загружен полностью',
+        default=False
+    )
+
+    class Meta:
+        ordering = ['path']
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        return self.path
+
+
+class LeaderboardEntry(models.Model):
+    ALL = 'all'
+    CATEGORY = 'category'
+    GENRE = 'genre'
+    SCOPES = (
+        (ALL, ALL),
+        (CATEGORY, CATEGORY),
+        (GENRE, GENRE)
+    )
+    scope = models.CharField(
+        verbose_name='Раздел',
+        max_length=MAX_LENGTH_CHARFIELD_ROLE,
+        choices=SCOPES
+    )
+    scope_id = models.PositiveIntegerField(
+        verbose_name='ID категории или жанра',
+        default=0
+    )
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries'
+    )
+    weighted_rating = models.FloatField(
+        verbose_name='Взвешенный рейтинг'
+    )
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов'
+    )
+
+    class Meta:
+        ordering = ['-weighted_rating', 'title']
+        verbose_name = 'Позиция в рейтинге'
+        verbose_name_plural = 'Позиции в рейтинге'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'scope_id', 'title'],
+                name='unique_leaderboard_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['scope', 'scope_id', '-weighted_rating', 'title'],
+                name='leaderboard_rating_idx'
+            ),
+            models.Index(
+                fields=['scope', 'scope_id', '-reviews_count', 'title'],
+                name='leaderboard_reviews_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.scope} {self.scope_id}: {self.title_id}'
+
+
+class TitleActivity(models.Model):
+    HOUR = 'hour'
+    DAY = 'day'
+    PERIODS = (
+        (HOUR, HOUR),
+        (DAY, DAY)
+    )
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        related_name='activity'
+    )
+    period = models.CharField(
+        verbose_name='Период',
+        max_length=MAX_LENGTH_CHARFIELD_ROLE,
+        choices=PERIODS
+    )
+    bucket_start = models.DateTimeField(
+        verbose_name='Начало периода'
+    )
+    reviews_count = models.IntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+    score_sum = models.IntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+
+    class Meta:
+        ordering = ['-bucket_start']
+        verbose_name = 'Активность по произведению'
+        verbose_name_plural = 'Активность по произведениям'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'period', 'bucket_start'],
+                name='unique_title_activity'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['bucket_start', 'period', 'title'],
+                name='title_activity_bucket_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} {self.period} {self.bucket_start}'
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, PENDING),
+        (SENT, SENT),
+        (FAILED, FAILED)
+    )
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=MAX_LENGTH_CHARFIELD
+    )
+    body = models.TextField(
+        verbose_name='Текст'
+    )
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=MAX_LENGTH_EMAILFIELD
+    )
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_LENGTH_EMAILFIELD
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=MAX_LENGTH_CHARFIELD_ROLE,
+        choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.IntegerField(
+        verbose_name='Попыток отправки',
+        default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now
+    )
+    claim = models.CharField(
+        verbose_name='Метка обработчика',
+        max_length=MAX_LENGTH_CHARFIELD_NAME,
+        blank=True
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outgoing_email_due_idx'
+            ),
+            models.Index(
+                fields=['claim'],
+                name='outgoing_email_claim_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,118 @@
+from collections import Counter
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.constants import (
+    EMAIL_BATCH_SIZE,
+    EMAIL_LEASE_TIME,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_DELAY,
+    EMAIL_RETRY_MAX_DELAY
+)
+from reviews.models import OutgoingEmail
+
+
+def queue_email(subject, body, recipient, from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        recipient=recipient,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(seconds=min(
+        EMAIL_RETRY_DELAY * 2 ** (attempts - 1), EMAIL_RETRY_MAX_DELAY
+    ))
+
+
+def claim_emails(batch_size=EMAIL_BATCH_SIZE):
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING,
+        next_attempt_at__lte=now
+    )
+    ids = list(
+        due.order_by('next_attempt_at', 'id').values_list(
+            'id', flat=True
+        )[:batch_size]
+    )
+    if not ids:
+        return []
+    claim = uuid4().hex
+    due.filter(id__in=ids).update(
+        claim=claim,
+        next_attempt_at=now + timedelta(seconds=EMAIL_LEASE_TIME),
+        attempts=F('attempts') + 1
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def deliver_emails(emails):
+    sent = set()
+    errors = {}
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    connection.send_messages([EmailMessage(
+                        subject=email.subject,
+                        body=email.body,
+                        from_email=email.from_email,
+                        to=[email.recipient]
+                    )])
+                except Exception as error:
+                    errors[email.id] = repr(error)
+                else:
+                    sent.add(email.id)
+    except Exception as error:
+        for email in emails:
+            if email.id not in sent:
+                errors.setdefault(email.id, repr(error))
+    return errors
+
+
+def save_delivery_results(emails, errors):
+    now = timezone.now()
+    stats = Counter()
+    delivered = [email.id for email in emails if email.id not in errors]
+    OutgoingEmail.objects.filter(id__in=delivered).update(
+        status=OutgoingEmail.SENT,
+        sent_at=now,
+        claim='',
+        last_error=''
+    )
+    stats['sent'] = len(delivered)
+    failed = [email for email in emails if email.id in errors]
+    for email in failed:
+        email.claim = ''
+        email.last_error = errors[email.id]
+        if email.attempts >= EMAIL_MAX_ATTEMPTS:
+            email.status = OutgoingEmail.FAILED
+            stats['failed'] += 1
+        else:
+            email.next_attempt_at = now + get_retry_delay(email.attempts)
+            stats['retried'] += 1
+    OutgoingEmail.objects.bulk_update(
+        failed, ['status', 'next_attempt_at', 'claim', 'last_error']
+    )
+    return stats
+
+
+def send_pending_emails(executor, batch_size=EMAIL_BATCH_SIZE, batches=1):
+    claimed = []
+    for _ in range(batches):
+        emails = claim_emails(batch_size)
+        if not emails:
+            break
+        claimed.append(emails)
+    stats = Counter()
+    for emails, errors in zip(claimed, executor.map(deliver_emails, claimed)):
+        stats += save_delivery_results(emails, errors)
+    return stats
@@ -0,0 +1,35 @@
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from reviews.constants import IMPORT_BATCH_SIZE
+from reviews.models import User
+
+
+def provision_user(username, email, **fields):
+    user, _ = User.objects.get_or_create(
+        username=username,
+        email=email,
+        defaults={'password': make_password(None), **fields}
+    )
+    return user, user.generate_confirmation_code()
+
+
+def provision_users(rows, batch_size=IMPORT_BATCH_SIZE):
+    password = make_password(None)
+    users = [User(**{'password': password, **row}) for row in rows]
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=batch_size)
+        if users and users[0].pk is None:
+            fill_user_ids(users, batch_size)
+    return users
+
+
+def fill_user_ids(users, batch_size):
+    ids = {}
+    usernames = [user.username for user in users]
+    for start in range(0, len(usernames), batch_size):
+        ids.update(User.objects.filter(
+            username__in=usernames[start:start + batch_size]
+        ).order_by().values_list('username', 'pk'))
+    for user in users:
+        user.pk = ids[user.username]
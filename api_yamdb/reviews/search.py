@@ -0,0 +1,92 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+SEARCH_TABLE = 'reviews_title_fts'
+SEARCH_NAME_WEIGHT = 10.0
+SEARCH_DESCRIPTION_WEIGHT = 1.0
+
+CREATE_SEARCH_INDEX_SQL = (
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name, description, content='reviews_title', content_rowid='id'
+    )
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    ''',
+    f'''
+    INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank)
+    VALUES (
+        'rank',
+        'bm25({SEARCH_NAME_WEIGHT}, {SEARCH_DESCRIPTION_WEIGHT})'
+    )
+    ''',
+)
+
+
+def search_index_supported():
+    return connection.vendor == 'sqlite'
+
+
+def create_search_index(**kwargs):
+    if not search_index_supported():
+        return
+    with connection.cursor() as cursor:
+        for sql in CREATE_SEARCH_INDEX_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_search_index():
+    create_search_index()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def build_match_query(value):
+    return ' '.join(
+        f'"{term}"*' for term in re.findall(r'\w+', value.lower())
+    )
+
+
+def search_titles(queryset, value):
+    match_query = build_match_query(value)
+    if not match_query:
+        return queryset.none()
+    if not search_index_supported():
+        return queryset.filter(
+            Q(name__icontains=value) | Q(description__icontains=value)
+        )
+    return queryset.extra(
+        select={'search_rank': f'{SEARCH_TABLE}.rank'},
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = reviews_title.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match_query],
+        order_by=['search_rank', 'id'],
+    )
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Q, Sum
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.constants import TRENDING_DAILY_DAYS, TRENDING_HOURLY_DAYS
+from reviews.models import (
+    Review,
+    Title,
+    TitleActivity,
+    title_ratings_changed
+)
+
+
+def get_bucket_start(moment, period):
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if period == TitleActivity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def add_title_activity(buckets):
+    if not buckets:
+        return
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        for (title_id, period, bucket_start), (reviews, score) in (
+            buckets.items()
+        ):
+            with transaction.atomic():
+                activity, _ = TitleActivity.objects.select_for_update(
+                ).get_or_create(
+                    title_id=title_id, period=period, bucket_start=bucket_start
+                )
+                activity.reviews_count += reviews
+                activity.score_sum += score
+                activity.save()
+        return
+    table = TitleActivity._meta.db_table
+    bucket_field = TitleActivity._meta.get_field('bucket_start')
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"""
+            INSERT INTO {table}
+                (title_id, period, bucket_start, reviews_count, score_sum)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (title_id, period, bucket_start) DO UPDATE SET
+                reviews_count = {table}.reviews_count
+                    + excluded.reviews_count,
+                score_sum = {table}.score_sum + excluded.score_sum
+            """,
+            [
+                (
+                    title_id, period,
+                    bucket_field.get_db_prep_value(bucket_start, connection),
+                    reviews, score
+                )
+                for (title_id, period, bucket_start), (reviews, score)
+                in buckets.items()
+            ]
+        )
+
+
+def record_title_activity(rows):
+    since = timezone.now() - timedelta(days=TRENDING_DAILY_DAYS)
+    buckets = defaultdict(lambda: [0, 0])
+    for title_id, pub_date, reviews, score in rows:
+        if pub_date < since or not (reviews or score):
+            continue
+        bucket = buckets[(
+            title_id,
+            TitleActivity.HOUR,
+            get_bucket_start(pub_date, TitleActivity.HOUR)
+        )]
+        bucket[0] += reviews
+        bucket[1] += score
+    add_title_activity({
+        key: values for key, values in buckets.items()
+        if tuple(values) > (0, 0)
+    })
+    subtract_title_activity({
+        key: values for key, values in buckets.items()
+        if tuple(values) < (0, 0)
+    })
+
+
+def subtract_title_activity(buckets):
+    for (title_id, period, bucket_start), (reviews, score) in (
+        buckets.items()
+    ):
+        changes = {
+            'reviews_count': F('reviews_count') + reviews,
+            'score_sum': F('score_sum') + score,
+        }
+        if not TitleActivity.objects.filter(
+            title_id=title_id, period=period, bucket_start=bucket_start
+        ).update(**changes):
+            TitleActivity.objects.filter(
+                title_id=title_id,
+                period=TitleActivity.DAY,
+                bucket_start=get_bucket_start(bucket_start, TitleActivity.DAY)
+            ).update(**changes)
+
+
+def compact_title_activity(now=None):
+    now = now or timezone.now()
+    hours = TitleActivity.objects.filter(
+        period=TitleActivity.HOUR,
+        bucket_start__lt=now - timedelta(days=TRENDING_HOURLY_DAYS)
+    )
+    with transaction.atomic():
+        buckets = defaultdict(lambda: [0, 0])
+        for title_id, bucket_start, reviews, score in hours.values_list(
+            'title_id', 'bucket_start', 'reviews_count', 'score_sum'
+        ).iterator():
+            bucket = buckets[(
+                title_id,
+                TitleActivity.DAY,
+                get_bucket_start(bucket_start, TitleActivity.DAY)
+            )]
+            bucket[0] += reviews
+            bucket[1] += score
+        merged, _ = hours.delete()
+        add_title_activity(buckets)
+        expired, _ = TitleActivity.objects.filter(
+            bucket_start__lt=get_bucket_start(
+                now - timedelta(days=TRENDING_DAILY_DAYS), TitleActivity.DAY
+            )
+        ).delete()
+        TitleActivity.objects.filter(reviews_count=0, score_sum=0).delete()
+    return merged, expired
+
+
+def rebuild_title_activity(now=None):
+    now = now or timezone.now()
+    reviews = Review.objects.filter(
+        pub_date__gte=now - timedelta(days=TRENDING_DAILY_DAYS)
+    ).order_by().values_list('title_id', 'pub_date', 'score')
+    with transaction.atomic():
+        TitleActivity.objects.all().delete()
+        record_title_activity(
+            (title_id, pub_date, 1, score)
+            for title_id, pub_date, score in reviews.iterator()
+        )
+        compact_title_activity(now)
+
+
+def get_trending_titles(days, limit, now=None):
+    since = (now or timezone.now()) - timedelta(days=days)
+    return TitleActivity.objects.filter(
+        Q(period=TitleActivity.HOUR, bucket_start__gte=since)
+        | Q(
+            period=TitleActivity.DAY,
+            bucket_start__gte=get_bucket_start(since, TitleActivity.DAY)
+        )
+    ).values('title_id', 'title__name', 'title__year').annotate(
+        reviews=Sum('reviews_count'),
+        score=Sum('score_sum')
+    ).filter(reviews__gt=0).order_by('-score', '-reviews', 'title_id')[:limit]
+
+
+@receiver(title_ratings_changed, sender=Title)
+def title_ratings_post_change(sender, rows, **kwargs):
+    record_title_activity(rows)
@@ -0,0 +1,273 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.bulk import bulk_create_reviews
+from reviews.models import (
+    Comment,
+    Review,
+    Title,
+    recalculate_comments_counts,
+    recalculate_title_ratings
+)
+from reviews.provisioning import provision_users
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    TITLES_LIST_QUERY_BUDGET = 3
+    TITLES_DETAIL_QUERY_BUDGET = 2
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    REVIEWS_LIST_QUERY_BUDGET = 2
+    REVIEW_DETAIL_QUERY_BUDGET = 1
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    COMMENTS_LIST_QUERY_BUDGET = 2
+    REVIEW_CREATE_QUERY_BUDGET = 7
+    TITLE_DELETE_QUERY_BUDGET = 11
+    USER_DELETE_QUERY_BUDGET = 16
+    DELETE_USERS_COUNT = 40
+
+    def test_01_titles_query_budget(self, client, admin_client,
+                                    django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        for idx in range(5):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            })
+
+        with django_assert_max_num_queries(self.TITLES_LIST_QUERY_BUDGET):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 5, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'полную страницу произведений.'
+        )
+        with django_assert_max_num_queries(self.TITLES_LIST_QUERY_BUDGET):
+            client.get(self.TITLES_URL, {'genre': genres[0]['slug']})
+
+        with django_assert_max_num_queries(self.TITLES_DETAIL_QUERY_BUDGET):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+        assert response.json()['category']['slug'] == (
+            titles[0]['category']
+        )
+
+    def test_02_reviews_query_budget(self, client, admin_client, admin, user,
+                                     user_client, moderator, moderator_client,
+                                     django_assert_max_num_queries):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with django_assert_max_num_queries(self.REVIEWS_LIST_QUERY_BUDGET):
+            response = client.get(url)
+        results = response.json()['results']
+        assert len(results) == len(reviews), (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'возвращает все отзывы произведения.'
+        )
+        assert {review['author'] for review in results} == {
+            review['author'] for review in reviews
+        }
+        assert {review['title'] for review in results} == {titles[0]['name']}
+
+        with django_assert_max_num_queries(self.REVIEW_DETAIL_QUERY_BUDGET):
+            response = client.get(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0]['id']
+                )
+            )
+        assert response.json()['author'] == reviews[0]['author']
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[-1]['id'])
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` для '
+            'произведения без отзывов возвращает ответ со статусом 200.'
+        )
+        assert response.json()['results'] == []
+        response = client.get(self.REVIEWS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` для '
+            'несуществующего произведения возвращает ответ со статусом 404.'
+        )
+
+    def test_03_comments_query_budget(self, client, admin_client, admin, user,
+                                      user_client, moderator,
+                                      moderator_client,
+                                      django_assert_max_num_queries):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        with django_assert_max_num_queries(self.COMMENTS_LIST_QUERY_BUDGET):
+            response = client.get(url)
+        results = response.json()['results']
+        assert len(results) == len(comments), (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'возвращает все комментарии к отзыву.'
+        )
+        assert {comment['review'] for comment in results} == {
+            reviews[0]['text']
+        }
+
+        with django_assert_max_num_queries(self.COMMENTS_LIST_QUERY_BUDGET):
+            response = client.get(url, {'compact': 'true'})
+        results = response.json()['results']
+        assert {comment['review'] for comment in results} == {
+            reviews[0]['id']
+        }, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` с '
+            'параметром `compact` возвращает id отзыва вместо его текста.'
+        )
+        assert {comment['author'] for comment in results} == {
+            comment['author'] for comment in comments
+        }
+
+        response = client.get(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=0
+            )
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` для '
+            'несуществующего отзыва возвращает ответ со статусом 404.'
+        )
+
+    def test_04_review_create_query_budget(self, admin_client, user_client,
+                                           django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 7}
+
+        with django_assert_max_num_queries(self.REVIEW_CREATE_QUERY_BUDGET):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'создаёт отзыв.'
+        )
+        assert response.json()['title'] == titles[0]['name']
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на то же произведение '
+            'возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Одно произведение - один отзыв!']
+        }
+        assert Title.objects.get(id=titles[0]['id']).rating == 7, (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг произведения.'
+        )
+
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0), data=data
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def create_discussion(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        users = provision_users(
+            {'username': f'reader{idx}', 'email': f'reader{idx}@yamdb.fake'}
+            for idx in range(self.DELETE_USERS_COUNT)
+        )
+        bulk_create_reviews([
+            {
+                'title_id': title['id'],
+                'author': author,
+                'text': 'Отзыв',
+                'score': idx % 10 + 1
+            }
+            for title in titles
+            for idx, author in enumerate(users)
+        ])
+        Comment.objects.bulk_create(
+            Comment(review=review, author=users[0], text='Комментарий')
+            for review in Review.objects.all()
+        )
+        recalculate_comments_counts()
+        return titles, users
+
+    def test_05_title_delete_query_budget(self, admin_client,
+                                          django_assert_max_num_queries):
+        titles, _ = self.create_discussion(admin_client)
+        kept = Title.objects.get(id=titles[1]['id'])
+
+        with django_assert_max_num_queries(self.TITLE_DELETE_QUERY_BUDGET):
+            response = admin_client.delete(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что удаление произведения с отзывами и комментариями '
+            'укладывается в фиксированное число запросов.'
+        )
+        assert not Review.objects.filter(title_id=titles[0]['id']).exists()
+        refreshed = Title.objects.get(id=kept.id)
+        assert (refreshed.rating_sum, refreshed.rating_count) == (
+            kept.rating_sum, kept.rating_count
+        ), (
+            'Проверьте, что удаление произведения не меняет рейтинг других '
+            'произведений.'
+        )
+
+    def test_06_user_delete_query_budget(self, admin_client,
+                                         django_assert_max_num_queries):
+        titles, users = self.create_discussion(admin_client)
+
+        with django_assert_max_num_queries(self.USER_DELETE_QUERY_BUDGET):
+            users[0].delete()
+        state = {
+            title.id: (title.rating_sum, title.rating_count, title.rating)
+            for title in Title.objects.all()
+        }
+        histograms = {
+            title.id: title.rating_histogram for title in Title.objects.all()
+        }
+        counts = dict(Review.objects.values_list('id', 'comments_count'))
+        recalculate_title_ratings()
+        recalculate_comments_counts()
+        assert state == {
+            title.id: (title.rating_sum, title.rating_count, title.rating)
+            for title in Title.objects.all()
+        } and histograms == {
+            title.id: title.rating_histogram for title in Title.objects.all()
+        }, (
+            'Проверьте, что удаление пользователя уменьшает счётчики оценок '
+            'всех произведений, на которые он писал отзывы.'
+        )
+        assert counts == dict(
+            Review.objects.values_list('id', 'comments_count')
+        ), (
+            'Проверьте, что удаление пользователя уменьшает '
+            '`comments_count` отзывов, которые он комментировал.'
+        )
+        assert Title.objects.get(id=titles[0]['id']).rating_count == (
+            self.DELETE_USERS_COUNT - 1
+        )
@@ -0,0 +1,178 @@
+from http import HTTPStatus
+
+import json
+from base64 import b64encode
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+from tests.utils import create_titles
+
+
+def encode_cursor(position):
+    return b64encode(json.dumps(position).encode()).decode()
+
+
+def collect_pages(client, url, params=None):
+    params = dict(params or {}, cursor='')
+    response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+        'возвращает ответ со статусом 200.'
+    )
+    data = response.json()
+    assert 'count' not in data and 'next' in data, (
+        f'Проверьте, что для эндпоинта `{url}` при передаче параметра '
+        '`cursor` используется курсорная пагинация.'
+    )
+    results = data['results']
+    while data['next']:
+        data = client.get(data['next']).json()
+        results.extend(data['results'])
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_titles_cursor_pagination(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        for idx in range(7):
+            admin_client.post(self.TITLES_URL, data={
+                'name': 'Дубль' if idx % 2 else f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[idx % 3]['slug']],
+                'category': categories[0]['slug'],
+            })
+
+        results = collect_pages(client, self.TITLES_URL)
+        expected = client.get(self.TITLES_URL).json()
+        assert len(results) == expected['count'], (
+            'Проверьте, что курсорная пагинация возвращает все произведения '
+            'без пропусков и повторов.'
+        )
+        assert [(title['name'], title['id']) for title in results] == sorted(
+            (title['name'], title['id']) for title in results
+        ), (
+            'Проверьте, что курсорная пагинация упорядочивает произведения '
+            'по названию и id.'
+        )
+        assert len({title['id'] for title in results}) == len(results)
+
+        results = collect_pages(
+            client, self.TITLES_URL, {'genre': genres[1]['slug']}
+        )
+        assert results and all(
+            genres[1] in title['genre'] for title in results
+        ), (
+            'Проверьте, что курсорная пагинация учитывает фильтры.'
+        )
+
+        response = client.get(self.TITLES_URL, {'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что при некорректном курсоре возвращается ответ со '
+            'статусом 404.'
+        )
+
+        for position in (
+            [None, None], ['a', 'x'], [[], {}], ['a'], ['a', 10 ** 30],
+            ['a', -1], ['a', 1e30]
+        ):
+            response = client.get(
+                self.TITLES_URL, {'cursor': encode_cursor(position)}
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что при подделанном курсоре с неверными '
+                'значениями возвращается ответ со статусом 404.'
+            )
+
+    def test_02_reviews_and_comments_cursor_pagination(
+        self, client, admin_client, django_user_model
+    ):
+        titles, _, _ = create_titles(admin_client)
+        users = [
+            django_user_model.objects.create_user(
+                username=f'reader_{idx}', email=f'reader_{idx}@yamdb.fake'
+            )
+            for idx in range(12)
+        ]
+        reviews = [
+            Review.objects.create(
+                title_id=titles[0]['id'], author=user, text='Отзыв', score=5
+            )
+            for user in users
+        ]
+        comments = [
+            Comment.objects.create(
+                review=reviews[0], author=user, text='Комментарий'
+            )
+            for user in users
+        ]
+        same_date = timezone.now()
+        Review.objects.filter(id__in=[
+            review.id for review in reviews[::2]
+        ]).update(pub_date=same_date)
+        Comment.objects.filter(id__in=[
+            comment.id for comment in comments[::2]
+        ]).update(pub_date=same_date)
+
+        for url, objects in (
+            (
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+                Review.objects.filter(title_id=titles[0]['id'])
+            ),
+            (
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0].id
+                ),
+                Comment.objects.filter(review=reviews[0])
+            ),
+        ):
+            results = collect_pages(client, url)
+            expected = list(
+                objects.order_by('-pub_date', '-id').values_list(
+                    'id', flat=True
+                )
+            )
+            assert [item['id'] for item in results] == expected, (
+                f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+                'записи без пропусков и повторов, упорядоченные по дате '
+                'публикации и id.'
+            )
+
+        for position in (
+            ['garbage', 1],
+            ['2020-01-01T00:00:00', 1],
+            [same_date.isoformat(), 'x'],
+            [None, None],
+            ['2020-01-01T00:00:00+00:00', 10 ** 30],
+            ['2020-01-01T00:00:00+00:00', -1],
+        ):
+            for url in (
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0].id
+                ),
+            ):
+                response = client.get(
+                    url, {'cursor': encode_cursor(position)}
+                )
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    'Проверьте, что при подделанном курсоре по дате '
+                    'публикации возвращается ответ со статусом 404.'
+                )
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0), {'cursor': ''}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсорная пагинация отзывов возвращает 404 для '
+            'несуществующего произведения.'
+        )
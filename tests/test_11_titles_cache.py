@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitlesCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CACHE_STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_titles_cache(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, genres = create_titles(admin_client)
+
+        response = client.get(self.TITLES_URL, {'year': 1984, 'genre': 'x'})
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            cached = client.get(self.TITLES_URL)
+        assert cached['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'обслуживается из кеша.'
+        )
+        assert cached.json() == response.json()
+
+        response = client.get(self.TITLES_URL, {'genre': 'x', 'year': 1984})
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кеша не зависит от порядка параметров '
+            'запроса.'
+        )
+
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url)['X-Cache'] == 'MISS'
+        assert client.get(detail_url)['X-Cache'] == 'HIT'
+
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        response = client.get(detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что кеш произведений сбрасывается при создании '
+            'отзыва.'
+        )
+
+        response = admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert genres[0] not in response.json()['genre'], (
+            'Проверьте, что кеш произведений сбрасывается при удалении '
+            'жанра.'
+        )
+        for url in ('/api/v1/leaderboards/', '/api/v1/trending/'):
+            assert client.get(url)['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/trending/')['X-Cache'] == 'HIT'
+
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к '
+            f'`{self.CACHE_STATS_URL}` возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {
+            'titles': {'hits': 3, 'misses': 5},
+            'leaderboards': {'hits': 0, 'misses': 1},
+            'trending': {'hits': 1, 'misses': 1},
+        }, (
+            'Проверьте, что кеш ведёт отдельные счётчики попаданий и '
+            'промахов для произведений, рейтингов и трендов.'
+        )
+
+    def test_02_cache_stats_permissions(self, client, user_client):
+        for api_client in (client, user_client):
+            response = api_client.get(self.CACHE_STATS_URL)
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.CACHE_STATS_URL}` доступен только '
+                'администратору.'
+            )
@@ -0,0 +1,58 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitlesSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, value):
+        response = client.get(self.TITLES_URL, {'search': value})
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_titles_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Возвращение',
+            'year': 1991,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Новый Терминатор возвращается',
+        })
+        sequel_id = response.json()['id']
+
+        assert self.search(client, 'терминатор') == [
+            titles[0]['id'], sequel_id
+        ], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет по названию и описанию без учёта регистра и сортирует '
+            'результаты по релевантности.'
+        )
+        assert self.search(client, 'КРЕП') == [titles[1]['id']], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет по началу слова.'
+        )
+        assert self.search(client, '"*') == []
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Орешек'}
+        )
+        assert self.search(client, 'крепкий') == []
+        assert self.search(client, 'орешек') == [titles[1]['id']], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        call_command('rebuild_search_index')
+        assert self.search(client, 'терминатор') == [sequel_id], (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
@@ -0,0 +1,108 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.utils import IntegrityError
+
+from reviews.models import (
+    Comment, Genre, ImportCheckpoint, Review, Title, User
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CsvImport:
+
+    def test_01_csv_import(self, client):
+        call_command('csv_import', batch_size=10)
+
+        assert User.objects.count() == 5
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.genre.through.objects.count() == 42, (
+            'Проверьте, что команда `csv_import` загружает связи '
+            'произведений с жанрами.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `csv_import` сохраняет даты публикации '
+            'из файла.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert response.json()['rating'] == int(sum(scores) / len(scores)), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+
+    def test_02_csv_import_resume(self, tmp_path):
+        (tmp_path / 'users.csv').write_text(
+            'id,username,email\n1,first,first@yamdb.fake\n', encoding='utf-8'
+        )
+        (tmp_path / 'titles_part-1.csv').write_text(
+            'id,name,year\n1,Первое,2000\n2,Второе,2001\n', encoding='utf-8'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,"Текст\nв две строки",1,7,2020-01-01T00:00:00Z\n'
+            '2,2,Текст,2,9,2020-01-02T00:00:00Z\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(IntegrityError):
+            call_command('csv_import', str(tmp_path), chunk_size=1)
+        assert Review.objects.count() == 1
+        checkpoint = ImportCheckpoint.objects.get(
+            path=str((tmp_path / 'review.csv').resolve())
+        )
+        assert checkpoint.last_id == '1' and checkpoint.rows == 1
+
+        User.objects.create(id=2, username='second', email='s@yamdb.fake')
+        call_command('csv_import', str(tmp_path), chunk_size=1)
+        assert list(
+            Review.objects.order_by('id').values_list('text', 'author_id')
+        ) == [('Текст\nв две строки', 1), ('Текст', 2)], (
+            'Проверьте, что команда `csv_import` продолжает прерванный '
+            'импорт с контрольной точки.'
+        )
+        assert Title.objects.count() == 2
+        assert not ImportCheckpoint.objects.exists()
+
+    def test_03_csv_import_upsert(self, tmp_path):
+        call_command('csv_import')
+        with pytest.raises(IntegrityError):
+            call_command('csv_import', restart=True)
+
+        (tmp_path / 'genre.csv').write_text(
+            'slug,name\ndrama,Драма\ncomedy,Комедии\nnoir,Нуар\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,Новый текст,100,1,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8'
+        )
+        out = StringIO()
+        call_command('csv_import', str(tmp_path), upsert=True, stdout=out)
+        assert 'добавлено 1, обновлено 1, пропущено 1' in out.getvalue(), (
+            'Проверьте, что команда `csv_import --upsert` сообщает '
+            'количество добавленных, обновлённых и пропущенных строк.'
+        )
+        assert Genre.objects.get(slug='comedy').name == 'Комедии'
+        assert Genre.objects.filter(slug='noir').exists()
+        assert Review.objects.get(pk=1).text == 'Новый текст'
+        assert Review.objects.count() == 72
+        title = Title.objects.get(pk=1)
+        assert title.rating_sum == sum(
+            title.reviews.values_list('score', flat=True)
+        )
+
+        call_command(
+            'csv_import', str(tmp_path / 'genre.csv'),
+            upsert=True, delete_missing=True, stdout=out
+        )
+        assert set(Genre.objects.values_list('slug', flat=True)) == {
+            'drama', 'comedy', 'noir'
+        }, (
+            'Проверьте, что команда `csv_import --upsert --delete-missing` '
+            'удаляет записи, которых нет в файле.'
+        )
@@ -0,0 +1,82 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{table}/'
+
+    def snapshot(self):
+        return {
+            'reviews': list(Review.objects.order_by('id').values_list(
+                'id', 'title_id', 'author_id', 'text', 'score', 'pub_date'
+            )),
+            'comments': list(Comment.objects.order_by('id').values_list(
+                'id', 'review_id', 'author_id', 'text', 'pub_date'
+            )),
+            'titles': list(Title.objects.order_by('id').values_list(
+                'id', 'name', 'year', 'category_id', 'rating_sum',
+                'rating_count'
+            )),
+            'genres': list(Title.genre.through.objects.order_by(
+                'id'
+            ).values_list('title_id', 'genre_id')),
+            'users': list(User.objects.order_by('id').values_list(
+                'username', 'email', 'role'
+            )),
+        }
+
+    def test_01_export_round_trip(self, tmp_path):
+        call_command('csv_import')
+        before = self.snapshot()
+
+        call_command('export_data', str(tmp_path), chunk_size=10)
+        for model in (User, Title, Genre, Category):
+            model.objects.all().delete()
+        call_command('csv_import', str(tmp_path))
+
+        assert self.snapshot() == before, (
+            'Проверьте, что выгрузка `export_data` в CSV загружается обратно '
+            'командой `csv_import` без потерь.'
+        )
+
+    def test_02_export_endpoint(self, client, user_client, admin_client):
+        call_command('csv_import')
+        url = self.EXPORT_URL_TEMPLATE.format(table='titles')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос администратора к '
+            f'`{self.EXPORT_URL_TEMPLATE}` возвращает ответ со статусом 200.'
+        )
+        assert response.streaming
+        titles = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert len(titles) == Title.objects.count()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert set(titles[0]['genre']) == set(
+            title.genre.values_list('slug', flat=True)
+        )
+        assert titles[0]['rating'] == title.rating
+
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(table='review'),
+            {'output': 'csv'}
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,title_id,text,author,score,pub_date'
+
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(table='unknown')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+
+from reviews.models import Category, Comment, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15FakeData:
+
+    OPTIONS = {
+        'users': 50, 'titles': 40, 'genres': 5, 'categories': 3,
+        'reviews': 600, 'comments': 100, 'seed': 7,
+    }
+
+    def review_counts(self):
+        return list(
+            Review.objects.values('title_id').annotate(
+                total=Count('id')
+            ).order_by('-total', 'title_id').values_list('total', flat=True)
+        )
+
+    def test_01_generate_fake_data(self):
+        call_command('generate_fake_data', **self.OPTIONS)
+        assert User.objects.count() == 50
+        assert Review.objects.count() == 600
+        assert Comment.objects.count() == 100
+        counts = self.review_counts()
+        assert max(counts) == 50 and sum(counts[:5]) > 600 // 4, (
+            'Проверьте, что команда `generate_fake_data` создаёт '
+            'неравномерное распределение отзывов по произведениям.'
+        )
+        title = Title.objects.order_by('-rating_count').first()
+        assert title.rating_count == title.reviews.count()
+        review = Review.objects.order_by('-comments_count').first()
+        assert review.comments_count == review.comments.count() > 0, (
+            'Проверьте, что команда `generate_fake_data` пересчитывает '
+            'количество комментариев к отзывам.'
+        )
+
+        Review.objects.all().delete()
+        call_command('generate_fake_data', **self.OPTIONS)
+        assert User.objects.count() == 100
+        assert self.review_counts() == counts, (
+            'Проверьте, что команда `generate_fake_data` с одинаковым seed '
+            'создаёт одинаковые данные.'
+        )
+
+    def test_02_invalid_options_create_nothing(self):
+        for options in (
+            {'reviews': 0, 'comments': 5},
+            {'users': 0, 'reviews': 5},
+            {'titles': 0, 'reviews': 5},
+            {'users': 2, 'titles': 2, 'reviews': 5},
+            {'users': -1},
+            {'batch_size': 0},
+        ):
+            with pytest.raises(CommandError):
+                call_command(
+                    'generate_fake_data', **{**self.OPTIONS, **options}
+                )
+            assert not Category.objects.exists() and not (
+                Title.objects.exists()
+            ), (
+                'Проверьте, что команда `generate_fake_data` проверяет '
+                f'параметры {options} до записи данных.'
+            )
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.constants import REVIEW_BULK_MAX_SIZE
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ReviewsBulk:
+
+    BULK_URL = '/api/v1/reviews/bulk/'
+    BULK_QUERY_BUDGET = 10
+
+    def test_01_bulk_create_reviews(self, client, admin_client, user,
+                                    user_client, moderator,
+                                    django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        data = [
+            {'title': first, 'text': 'Первый', 'score': 8},
+            {'title': second, 'text': 'Второй', 'score': 4},
+            {'title': first, 'text': 'Повтор', 'score': 1},
+            {'title': 0, 'text': 'Нет произведения', 'score': 5},
+            {'title': second, 'text': 'Оценка', 'score': 11},
+            {'title': second, 'text': 'Чужой', 'score': 2,
+             'author': moderator.username},
+        ]
+
+        assert client.post(
+            self.BULK_URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        with django_assert_max_num_queries(self.BULK_QUERY_BUDGET):
+            response = user_client.post(self.BULK_URL, data=data,
+                                        format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        response_data = response.json()
+        statuses = [item['status'] for item in response_data['results']]
+        assert statuses == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.BAD_REQUEST, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.BAD_REQUEST
+        ], (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` возвращает '
+            'результат для каждого отзыва в порядке запроса.'
+        )
+        assert response_data['created'] == 2
+        assert Review.objects.get(
+            id=response_data['results'][0]['id']
+        ).author == user
+        assert 'score' in response_data['results'][4]['errors']
+        assert 'author' in response_data['results'][5]['errors']
+        assert Title.objects.get(id=first).rating == 8, (
+            'Проверьте, что массовое добавление отзывов обновляет рейтинг '
+            'произведений.'
+        )
+        assert Title.objects.get(id=second).rating == 4
+        user_client.get(f'/api/v1/titles/{first}/')
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {'title': first, 'text': 'От модератора', 'score': 2,
+             'author': moderator.username},
+            {'title': first, 'text': 'От пользователя', 'score': 2,
+             'author': user.username},
+        ], format='json')
+        statuses = [item['status'] for item in response.json()['results']]
+        assert statuses == [HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST], (
+            'Проверьте, что администратор может добавлять отзывы от имени '
+            'других пользователей.'
+        )
+        assert Title.objects.get(id=first).rating == 5
+
+        response = user_client.get(f'/api/v1/titles/{first}/')
+        assert response.json()['rating'] == 5, (
+            'Проверьте, что массовое добавление отзывов сбрасывает кеш '
+            'каталога.'
+        )
+
+    def test_02_bulk_invalid_payload(self, user_client):
+        for data in ([], {'title': 1}, [{}] * (REVIEW_BULK_MAX_SIZE + 1)):
+            response = user_client.post(self.BULK_URL, data=data,
+                                        format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{self.BULK_URL}` с пустым, '
+                'не списком или слишком большим набором отзывов возвращает '
+                'ответ со статусом 400.'
+            )
+        assert not Review.objects.exists()
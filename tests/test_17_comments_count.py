@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CommentsCount:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def get_counts(self, client, title_id):
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return {
+            review['id']: review.get('comments_count')
+            for review in response.json()['results']
+        }
+
+    def test_01_comments_count_follows_comment_writes(
+        self, client, admin_client, admin, user, user_client, moderator,
+        moderator_client
+    ):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_counts(client, title_id) == {
+            reviews[0]['id']: 3,
+            reviews[1]['id']: 0,
+            reviews[2]['id']: 0,
+        }, (
+            'Проверьте, что отзыв содержит поле `comments_count` с '
+            'количеством комментариев.'
+        )
+
+        response = admin_client.delete(
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id'],
+                comment_id=comments[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_counts(client, title_id)[reviews[0]['id']] == 2, (
+            'Проверьте, что удаление комментария уменьшает `comments_count`.'
+        )
+
+        review = Review.objects.get(id=reviews[0]['id'])
+        Comment.objects.create(review=review, author=admin, text='Ещё')
+        review.text = 'Изменённый отзыв'
+        review.save()
+        assert Review.objects.get(id=review.id).comments_count == 3, (
+            'Проверьте, что сохранение отзыва не перезаписывает '
+            '`comments_count` устаревшим значением.'
+        )
+
+        comment = Comment.objects.get(id=comments[1]['id'])
+        comment.review_id = reviews[1]['id']
+        comment.save()
+        moderator.delete()
+        assert self.get_counts(client, title_id) == {
+            reviews[0]['id']: 1,
+            reviews[1]['id']: 1,
+        }, (
+            'Проверьте, что `comments_count` учитывает перенос комментария и '
+            'каскадное удаление.'
+        )
+
+    def test_02_stale_comment_moves(self, admin_client, admin, user,
+                                    user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, _ = create_comments(admin_client, author_map)
+        first = Comment.objects.get(id=comments[0]['id'])
+        second = Comment.objects.get(id=comments[0]['id'])
+        first.review_id = reviews[1]['id']
+        first.save()
+        second.review_id = reviews[1]['id']
+        second.save()
+        assert dict(Review.objects.values_list('id', 'comments_count')) == {
+            reviews[0]['id']: 1,
+            reviews[1]['id']: 1,
+        }, (
+            'Проверьте, что перенос комментария учитывает текущий отзыв '
+            'комментария в базе, а не загруженную копию.'
+        )
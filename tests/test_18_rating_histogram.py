@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18RatingHistogram:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    HISTOGRAMS_URL = '/api/v1/titles/histograms/'
+
+    def get_histogram(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        histogram = response.json().get('rating_histogram')
+        assert histogram is not None and len(histogram) == 11, (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит гистограмму '
+            '`rating_histogram` с одиннадцатью оценками.'
+        )
+        return {
+            int(score): count for score, count in histogram.items() if count
+        }
+
+    def test_01_histogram_follows_review_writes(self, client, admin_client,
+                                                admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_histogram(client, title_id) == {5: 2}
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        assert self.get_histogram(client, title_id) == {5: 1, 9: 1}, (
+            'Проверьте, что гистограмма оценок обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            )
+        )
+        assert self.get_histogram(client, title_id) == {5: 1}, (
+            'Проверьте, что гистограмма оценок обновляется при удалении '
+            'отзыва.'
+        )
+        assert 'rating_histogram' not in client.get(
+            '/api/v1/titles/'
+        ).json()['results'][0]
+
+        Review.objects.filter(title_id=title_id).update(score=2)
+        Title.objects.filter(id=titles[1]['id']).update(score_7_count=3)
+        call_command('rebuild_title_ratings')
+        title = Title.objects.get(id=title_id)
+        assert title.rating_histogram[2] == 1 and title.rating == 2, (
+            'Проверьте, что команда `rebuild_title_ratings` пересчитывает '
+            'гистограммы и рейтинги по отзывам.'
+        )
+        assert not any(
+            Title.objects.get(id=titles[1]['id']).rating_histogram.values()
+        )
+
+    def test_02_histograms_batch(self, client, admin_client, admin,
+                                 user_client, user,
+                                 django_assert_max_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        ids = ','.join(str(title['id']) for title in titles)
+
+        with django_assert_max_num_queries(1):
+            response = client.get(self.HISTOGRAMS_URL, {'ids': f'{ids},0'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.HISTOGRAMS_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [item['id'] for item in data] == sorted(
+            title['id'] for title in titles
+        )
+        histograms = {
+            item['id']: item['rating_histogram'] for item in data
+        }
+        assert histograms[titles[0]['id']]['5'] == 2
+        assert sum(histograms[titles[1]['id']].values()) == 0
+
+        for ids in (
+            '', 'a,b', ','.join(map(str, range(1, 102))),
+            '99999999999999999999999', '-1'
+        ):
+            response = client.get(self.HISTOGRAMS_URL, {'ids': ids})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.HISTOGRAMS_URL}` с '
+                'некорректным списком id возвращает ответ со статусом 400.'
+            )
+
+    def test_03_stale_review_saves(self, admin_client, admin, user_client,
+                                   user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        first = Review.objects.get(id=reviews[0]['id'])
+        second = Review.objects.get(id=reviews[0]['id'])
+        first.score = 9
+        first.save()
+        second.score = 3
+        second.save()
+        title = Title.objects.get(id=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (8, 2), (
+            'Проверьте, что сохранение отзыва вычисляет изменение оценки по '
+            'текущему состоянию отзыва в базе, а не по загруженной копии.'
+        )
+        assert {
+            score: count
+            for score, count in title.rating_histogram.items() if count
+        } == {3: 1, 5: 1}, (
+            'Проверьте, что параллельные изменения одного отзыва не '
+            'искажают гистограмму оценок.'
+        )
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import LeaderboardEntry, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Leaderboards:
+
+    LEADERBOARDS_URL = '/api/v1/leaderboards/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_ids(self, client, params=None):
+        response = client.get(self.LEADERBOARDS_URL, params or {})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.LEADERBOARDS_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()]
+
+    def test_01_leaderboards_follow_reviews(self, client, admin_client,
+                                            admin, user_client, user,
+                                            moderator_client,
+                                            django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Отлично', 10)
+        for author_client in (admin_client, user_client, moderator_client):
+            create_single_review(author_client, second, 'Хорошо', 8)
+
+        assert self.get_ids(client)[:2] == [second, first], (
+            'Проверьте, что взвешенный рейтинг не позволяет произведению '
+            'с единственным отзывом обогнать произведение с несколькими '
+            'высокими оценками.'
+        )
+        response = client.get(self.LEADERBOARDS_URL, {'order': 'reviews'})
+        assert response.json()[0] == {
+            'id': second,
+            'name': titles[1]['name'],
+            'year': titles[1]['year'],
+            'weighted_rating': pytest.approx((24 + 50) / 13),
+            'reviews_count': 3,
+        }
+
+        for genre in titles[0]['genre']:
+            assert self.get_ids(client, {'genre': genre}) == [first]
+        assert self.get_ids(
+            client, {'category': titles[1]['category']}
+        ) == [second], (
+            'Проверьте, что рейтинг по категории содержит только '
+            'произведения этой категории.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=second),
+            data={'category': titles[0]['category']}
+        )
+        assert self.get_ids(
+            client, {'category': titles[0]['category']}
+        ) == [second, first], (
+            'Проверьте, что смена категории произведения обновляет рейтинг '
+            'по категориям.'
+        )
+
+        Title.objects.filter(id=first).update(rating_sum=100, rating_count=10)
+        LeaderboardEntry.objects.all().delete()
+        call_command('rebuild_leaderboards')
+        assert self.get_ids(client, {'limit': 1}) == [first], (
+            'Проверьте, что команда `rebuild_leaderboards` перестраивает '
+            'рейтинги.'
+        )
+        with django_assert_max_num_queries(2):
+            client.get(
+                self.LEADERBOARDS_URL,
+                {'genre': genres[0]['slug'], 'limit': 5}
+            )
+
+    def test_02_leaderboards_invalid_params(self, client):
+        for params, status in (
+            ({'order': 'name'}, HTTPStatus.BAD_REQUEST),
+            ({'limit': 0}, HTTPStatus.BAD_REQUEST),
+            ({'limit': 'a'}, HTTPStatus.BAD_REQUEST),
+            ({'category': 'a', 'genre': 'b'}, HTTPStatus.BAD_REQUEST),
+            ({'genre': 'missing'}, HTTPStatus.NOT_FOUND),
+        ):
+            response = client.get(self.LEADERBOARDS_URL, params)
+            assert response.status_code == status, (
+                f'Проверьте, что GET-запрос к `{self.LEADERBOARDS_URL}` с '
+                f'параметрами {params} возвращает ответ со статусом {status}.'
+            )
+
+    def test_03_leaderboards_skip_unrated_titles(self, client, admin_client,
+                                                 user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Так себе', 4
+        ).json()
+        for order in ('rating', 'reviews'):
+            assert self.get_ids(client, {'order': order}) == [
+                titles[0]['id']
+            ], (
+                'Проверьте, что произведения без отзывов не попадают в '
+                'рейтинг и не обгоняют произведения с невысокими оценками.'
+            )
+        user_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+        )
+        assert self.get_ids(client) == [], (
+            'Проверьте, что произведение без отзывов пропадает из рейтинга '
+            'после удаления последнего отзыва.'
+        )
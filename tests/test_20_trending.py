@@ -0,0 +1,150 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import Review, Title, TitleActivity
+from reviews.trending import record_title_activity
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Trending:
+
+    TRENDING_URL = '/api/v1/trending/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_trending(self, client, days):
+        response = client.get(self.TRENDING_URL, {'days': days})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TRENDING_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        return [
+            (item['id'], item['reviews_count']) for item in response.json()
+        ]
+
+    def test_01_trending_follows_reviews(self, client, admin_client,
+                                         user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Да', 9)
+        create_single_review(user_client, second, 'Нет', 2)
+        create_single_review(moderator_client, second, 'Нет', 3)
+
+        assert self.get_trending(client, 1) == [(first, 1), (second, 2)], (
+            'Проверьте, что популярные произведения упорядочены по сумме '
+            'оценок за период.'
+        )
+        assert client.get(
+            self.TRENDING_URL, {'days': 1}
+        ).json()[0]['average_score'] == 9
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=second,
+                review_id=Review.objects.get(title_id=second, score=2).id
+            )
+        )
+        assert self.get_trending(client, 7) == [(first, 1), (second, 1)], (
+            'Проверьте, что удаление отзыва уменьшает счётчики активности.'
+        )
+
+        TitleActivity.objects.all().delete()
+        call_command('compact_title_activity', rebuild=True)
+        assert self.get_trending(client, 30) == [(first, 1), (second, 1)], (
+            'Проверьте, что команда `compact_title_activity --rebuild` '
+            'пересчитывает счётчики по отзывам.'
+        )
+
+    def test_02_compaction(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Сейчас', 5)
+        day = timezone.now().replace(
+            hour=10, minute=0, second=0, microsecond=0
+        ) - timedelta(days=3)
+        for bucket_start, reviews, score in (
+            (day, 2, 18),
+            (day + timedelta(hours=3), 1, 10),
+            (day - timedelta(days=40), 5, 50),
+        ):
+            TitleActivity.objects.create(
+                title_id=second,
+                period=TitleActivity.HOUR,
+                bucket_start=bucket_start,
+                reviews_count=reviews,
+                score_sum=score
+            )
+
+        call_command('compact_title_activity')
+        assert list(TitleActivity.objects.filter(title_id=second).values_list(
+            'period', 'bucket_start', 'reviews_count', 'score_sum'
+        )) == [(TitleActivity.DAY, day.replace(hour=0), 3, 28)], (
+            'Проверьте, что команда `compact_title_activity` объединяет '
+            'старые почасовые счётчики в дневные и удаляет устаревшие.'
+        )
+        assert TitleActivity.objects.get(title_id=first).period == (
+            TitleActivity.HOUR
+        )
+        assert self.get_trending(client, 7) == [(second, 3), (first, 1)]
+        assert self.get_trending(client, 1) == [(first, 1)]
+
+        record_title_activity([(second, day + timedelta(hours=1), -1, -9)])
+        assert TitleActivity.objects.filter(title_id=second).values_list(
+            'reviews_count', 'score_sum'
+        ).get() == (2, 19), (
+            'Проверьте, что удаление отзыва уменьшает дневной счётчик, если '
+            'почасовой уже объединён.'
+        )
+
+        response = client.get(self.TRENDING_URL, {'days': 2})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.TRENDING_URL}` с '
+            'неподдерживаемым периодом возвращает ответ со статусом 400.'
+        )
+
+    def test_03_delete_title_with_fresh_review(self, admin_client,
+                                               user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Свежий', 7)
+        response = admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что произведение со свежим отзывом можно удалить.'
+        )
+        assert not TitleActivity.objects.exists()
+
+        create_single_review(user_client, titles[1]['id'], 'Свежий', 7)
+        Title.objects.all().delete()
+        assert not Title.objects.exists(), (
+            'Проверьте, что массовое удаление произведений со свежими '
+            'отзывами не нарушает связи счётчиков активности.'
+        )
+        assert not TitleActivity.objects.exists()
+
+    def test_04_delete_user_and_title(self, admin_client, user, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Свежий', 7)
+        create_single_review(user_client, second, 'Свежий', 4)
+        create_single_review(admin_client, second, 'Свежий', 5)
+        with transaction.atomic():
+            Title.objects.filter(pk=first).delete()
+            user.delete()
+        assert not Title.objects.filter(pk=first).exists(), (
+            'Проверьте, что удаление пользователя, чьи отзывы относятся к '
+            'удаляемому произведению, не нарушает связи счётчиков '
+            'активности.'
+        )
+        assert list(TitleActivity.objects.values_list(
+            'title_id', 'reviews_count', 'score_sum'
+        )) == [(second, 1, 5)], (
+            'Проверьте, что удаление отзывов уменьшает счётчики активности.'
+        )
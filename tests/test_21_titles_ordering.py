@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitlesOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметрами '
+            f'{params} возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ordering_and_ranges(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Без отзывов',
+            'year': 2000,
+            'category': titles[0]['category'],
+            'genre': titles[0]['genre'],
+        })
+        create_single_review(user_client, titles[0]['id'], 'Текст', 3)
+        create_single_review(user_client, titles[1]['id'], 'Текст', 9)
+
+        assert self.get_names(client, {'ordering': '-rating'}) == [
+            'Крепкий орешек', 'Терминатор', 'Без отзывов'
+        ], (
+            'Проверьте, что параметр `ordering=-rating` сортирует '
+            'произведения по убыванию рейтинга, а произведения без оценок '
+            'выводятся в конце.'
+        )
+        assert self.get_names(client, {'ordering': 'rating'}) == [
+            'Терминатор', 'Крепкий орешек', 'Без отзывов'
+        ]
+        assert self.get_names(client, {'ordering': '-year'}) == [
+            'Без отзывов', 'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что параметр `ordering=-year` сортирует '
+            'произведения по убыванию года выпуска.'
+        )
+        assert self.get_names(
+            client, {'year_min': 1985, 'year_max': 1999}
+        ) == ['Крепкий орешек'], (
+            'Проверьте, что параметры `year_min` и `year_max` ограничивают '
+            'год выпуска включительно.'
+        )
+        assert self.get_names(
+            client, {'rating_min': 3, 'ordering': 'year'}
+        ) == ['Терминатор', 'Крепкий орешек'], (
+            'Проверьте, что параметр `rating_min` исключает произведения с '
+            'меньшим рейтингом и без оценок.'
+        )
+
+    def test_02_invalid_ordering(self, client):
+        response = client.get(self.TITLES_URL, {'ordering': 'description'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с неизвестным '
+            'значением `ordering` возвращает ответ со статусом 400.'
+        )
+        response = client.get(
+            self.TITLES_URL, {'ordering': '-rating', 'cursor': ''}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с `ordering` '
+            'и `cursor` возвращает ответ со статусом 400, а не игнорирует '
+            'сортировку.'
+        )
+
+    def test_03_invalid_ranges(self, client):
+        for params in (
+            {'year_min': 10 ** 26},
+            {'year_max': -10 ** 26},
+            {'year': 10 ** 26},
+            {'year_min': '1e30'},
+            {'rating_min': 'nan'},
+            {'rating_min': 'inf'},
+            {'rating_min': 11},
+        ):
+            response = client.get(self.TITLES_URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с '
+                f'параметрами {params} вне допустимого диапазона '
+                'возвращает ответ со статусом 400.'
+            )
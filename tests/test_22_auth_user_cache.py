@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22AuthUserCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+    ME_URL = '/api/v1/users/me/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context)
+
+    def test_01_cached_user_skips_query(self, client, user_client):
+        anonymous = self.count_queries(client, self.CATEGORIES_URL)
+        assert self.count_queries(
+            user_client, self.CATEGORIES_URL
+        ) == anonymous + 1
+        assert self.count_queries(
+            user_client, self.CATEGORIES_URL
+        ) == anonymous, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из базы данных.'
+        )
+        response = user_client.get(self.ME_URL)
+        assert response.json()['email'] == 'testuser@yamdb.fake', (
+            f'Проверьте, что GET-запрос к `{self.ME_URL}` возвращает все '
+            'данные пользователя.'
+        )
+
+    def test_02_role_and_active_changes(self, user, user_client):
+        assert user_client.get(
+            self.USERS_URL
+        ).status_code == HTTPStatus.FORBIDDEN
+
+        user.role = user.ADMIN
+        user.save()
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя сбрасывает '
+            'закешированные данные аутентификации.'
+        )
+
+        user.is_active = False
+        user.save()
+        assert user_client.get(
+            self.USERS_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что деактивированный пользователь не проходит '
+            'аутентификацию.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.constants import EMAIL_MAX_ATTEMPTS
+from reviews.models import OutgoingEmail
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('Почтовый сервер недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, username='outbox_user'):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': username,
+            'email': f'{username}@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return OutgoingEmail.objects.get(recipient=f'{username}@yamdb.fake')
+
+    def test_01_signup_queues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        email = self.signup(client)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо сразу, а добавляет его в очередь.'
+        )
+        assert email.status == OutgoingEmail.PENDING
+        self.signup(client, 'outbox_second')
+
+        call_command('send_emails', '--once', '--batch-size', '1')
+        assert len(mail.outbox) == outbox_before_count + 2, (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        assert not OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.SENT
+        ).exists()
+
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == outbox_before_count + 2, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, client, settings):
+        email = self.signup(client)
+        settings.EMAIL_BACKEND = (
+            'tests.test_23_email_outbox.FailingBackend'
+        )
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неудачная отправка откладывается на потом.'
+        )
+
+        email.attempts = EMAIL_MAX_ATTEMPTS - 1
+        email.next_attempt_at = timezone.now()
+        email.save()
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается как '
+            'недоставленное.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        outbox_before_count = len(mail.outbox)
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == outbox_before_count
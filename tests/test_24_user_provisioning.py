@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import User
+from reviews.provisioning import provision_users
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def count_writes(context):
+    return sum(
+        query['sql'].lstrip().upper().startswith(WRITE_STATEMENTS)
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24UserProvisioning:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {
+        'username': 'provisioned',
+        'email': 'provisioned@yamdb.fake'
+    }
+
+    def test_01_signup_writes_user_once(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert count_writes(context) == 2, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` записывает '
+            'нового пользователя в базу данных один раз.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert count_writes(context) == 1, (
+            f'Проверьте, что повторный POST-запрос к `{self.URL_SIGNUP}` не '
+            'перезаписывает существующего пользователя.'
+        )
+        assert User.objects.count() == 1
+
+    def test_02_provision_users_batch(self):
+        rows = [
+            {
+                'username': f'batch_{index}',
+                'email': f'batch_{index}@yamdb.fake'
+            }
+            for index in range(250)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            users = provision_users(rows, batch_size=100)
+        assert User.objects.count() == len(rows)
+        assert count_writes(context) < len(rows) // 10, (
+            'Проверьте, что `provision_users` добавляет пользователей '
+            'пачками.'
+        )
+        user = User.objects.get(username='batch_7')
+        assert users[7].pk == user.pk
+        assert not user.has_usable_password()
+        assert default_token_generator.check_token(
+            user, users[7].generate_confirmation_code()
+        )
+
+    def test_03_provision_users_is_atomic(self):
+        rows = [
+            {'username': 'first', 'email': 'same@yamdb.fake'},
+            {'username': 'second', 'email': 'same@yamdb.fake'},
+        ]
+        with pytest.raises(IntegrityError):
+            provision_users(rows)
+        assert not User.objects.exists(), (
+            'Проверьте, что `provision_users` не сохраняет часть '
+            'пользователей при ошибке.'
+        )